@@ -1,6 +1,5 @@
 #source .venv/Scripts/activate
-import cv2
-import mediapipe as mp
+import argparse
 import pygame
 import random
 import math
@@ -8,19 +7,44 @@ import sys
 import os
 import sqlite3
 import time
-
-# Initialize MediaPipe Hand
-mp_hands = mp.solutions.hands
-mp_drawing = mp.solutions.drawing_utils
-hands = mp_hands.Hands(max_num_hands=1, min_detection_confidence=0.7)
-
-# Helper to check if index finger is up (extended)
-def is_index_finger_up(landmarks):
-    return landmarks[8].y < landmarks[6].y and abs(landmarks[8].x - landmarks[6].x) < 0.1
-
-# Helper to check if all fingers are folded (for pause)
-def is_hand_closed(landmarks):
-    return all(landmarks[i].y > landmarks[i-2].y for i in [8, 12, 16, 20])
+import numpy as np
+
+from pointer_filter import PointerFilter
+from landmark_log import LandmarkRecorder
+from input_backends import create_backend, ReplayBackend, DEFAULT_INPUT, INPUT_ENV_VAR
+from hand_inference import RESULT_CAPTURE_TIME, RESULT_START_TIME, RESULT_CONVERTED_TIME, RESULT_DONE_TIME
+from profiler import FrameProfiler
+from render_cache import SpriteCache, ScreenCache, TextCache
+from dirty_rects import DirtyRectTracker, DISPLAY_UPDATE_MODES
+from backgrounds import BackgroundEngine
+from particles import ParticleEngine
+from falling_objects import ObjectStore, KINDS, BANANA, COCONUT, BOMB, WOBBLE_RATE
+from collision import CatchDetector
+from simulation import FixedTimestep, lerp
+from quality import QualityController, QUALITY_LEVELS
+from score_store import ScoreStore, LeaderboardCache
+from score_writer import ScoreWriter
+
+# Command line options
+parser = argparse.ArgumentParser(description='Banana Rush')
+parser.add_argument('--input', metavar='NAME[:ARG]', default=os.environ.get(INPUT_ENV_VAR, DEFAULT_INPUT),
+                    help='input backend: mediapipe[:CAMERA], video:PATH, mouse, synthetic or replay:PATH '
+                         f'(default: ${INPUT_ENV_VAR} or {DEFAULT_INPUT})')
+parser.add_argument('--seed', type=int, help='seed the random generator for a reproducible game')
+parser.add_argument('--record', metavar='PATH', help='record hand landmarks and key presses to PATH')
+parser.add_argument('--replay', metavar='PATH', help='shorthand for --input replay:PATH')
+parser.add_argument('--profile', metavar='PATH', help='append stage timing percentiles to PATH (JSON lines) every 10 s')
+parser.add_argument('--stats', action='store_true',
+                    help='print cache, simulation, display and score writer counters on exit')
+parser.add_argument('--display-update', choices=DISPLAY_UPDATE_MODES, default='dirty',
+                    help='send only changed areas to the display (dirty, default) or flip the whole screen every frame')
+parser.add_argument('--fps', type=int, default=60,
+                    help='frame rate cap while playing, 0 for none; the game itself always runs at 60 steps/s')
+parser.add_argument('--stress', type=int, default=0, metavar='N',
+                    help='keep at least N objects falling at once (benchmarks the object path)')
+args = parser.parse_args()
+if args.replay:
+    args.input = f'replay:{args.replay}'
 
 # Initialize Pygame
 pygame.init()
@@ -28,106 +52,83 @@ WIDTH, HEIGHT = 800, 600
 screen = pygame.display.set_mode((WIDTH, HEIGHT))
 pygame.display.set_caption('Banana Rush')
 clock = pygame.time.Clock()
+# Only the areas drawn this frame or last frame go to the display (--display-update)
+dirty = DirtyRectTracker(screen.get_rect(), args.display_update)
+# Menus and other static screens are only redrawn when what they show changes
+screen_cache = ScreenCache(screen, dirty)
+# The window system lost what was on the display (window uncovered or restored);
+# pygame 1 only has VIDEOEXPOSE
+EXPOSE_EVENTS = tuple(getattr(pygame, name) for name in ('VIDEOEXPOSE', 'WINDOWEXPOSED', 'WINDOWRESTORED')
+                      if hasattr(pygame, name))
 
 font = pygame.font.SysFont('comicsans', 36)
 small_font = pygame.font.SysFont('comicsans', 24)
+text_cache = TextCache()  # rendered text with its outline/shadow, shared by the HUD and menus
 
 # -------------------- High scores (SQLite) --------------------
 DB_PATH = os.path.join(os.path.dirname(__file__), 'scores.db')
+scores_version = 0  # bumped on every saved score; screens that list scores key on it
 
-def init_db():
+def open_score_store():
     try:
-        conn = sqlite3.connect(DB_PATH)
-        cur = conn.cursor()
-        cur.execute(
-            """
-            CREATE TABLE IF NOT EXISTS scores (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT NOT NULL,
-                score INTEGER NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-            """
-        )
-        conn.commit()
-    finally:
-        try:
-            conn.close()
-        except Exception:
-            pass
+        store = ScoreStore(DB_PATH)
+    except sqlite3.Error as e:
+        print('Score database unavailable:', e)
+        return None, None, None
+    # Saved scores are written on a background thread so game over doesn't hitch
+    writer = ScoreWriter(DB_PATH)
+    return store, writer, LeaderboardCache(store, writer=writer)
 
 def add_score(name: str, score_value: int, level: str = 'unknown', duration_sec: int = 0):
+    """Save a finished game; returns its (name, score, level, duration_sec, created_at) row or None."""
+    global scores_version
     try:
-        conn = sqlite3.connect(DB_PATH)
-        cur = conn.cursor()
-        # ensure columns exist (migration)
-        try:
-            cur.execute("ALTER TABLE scores ADD COLUMN level TEXT DEFAULT 'unknown'")
-        except Exception:
-            pass
-        try:
-            cur.execute("ALTER TABLE scores ADD COLUMN duration_sec INTEGER DEFAULT 0")
-        except Exception:
-            pass
-        cur.execute(
-            "INSERT INTO scores(name, score, level, duration_sec) VALUES (?, ?, ?, ?)",
-            (name, int(score_value), level, int(duration_sec)),
-        )
-        conn.commit()
+        row = leaderboard.add_score(name, score_value, level, duration_sec)
+        scores_version += 1
+        return row
     except Exception as e:
         print('Score save failed:', e)
-    finally:
-        try:
-            conn.close()
-        except Exception:
-            pass
+        return None
 
 def get_top_scores(limit: int = 5):
     try:
-        conn = sqlite3.connect(DB_PATH)
-        cur = conn.cursor()
-        # include level and duration if present
-        try:
-            cur.execute("SELECT name, score, level, duration_sec, created_at FROM scores ORDER BY score DESC, created_at ASC LIMIT ?", (limit,))
-        except Exception:
-            cur.execute("SELECT name, score, created_at FROM scores ORDER BY score DESC, created_at ASC LIMIT ?", (limit,))
-        rows = cur.fetchall()
-        return rows
+        return leaderboard.top_scores(limit)
     except Exception as e:
         print('Read scores failed:', e)
         return []
-    finally:
-        try:
-            conn.close()
-        except Exception:
-            pass
+
+def get_scores_page(cursor=None, limit: int = 5, level=None):
+    """(rows, next page cursor) of the ranking; see ScoreStore.page()."""
+    try:
+        return leaderboard.page(cursor, limit, level)
+    except Exception as e:
+        print('Read scores failed:', e)
+        return [], None
+
+def get_placing(row):
+    """(overall rank, rank within its difficulty) of a saved score row, or None."""
+    try:
+        name, score_value, level, duration_sec, created_at = row
+        return leaderboard.rank(score_value, created_at), leaderboard.rank(score_value, created_at, level)
+    except Exception as e:
+        print('Rank lookup failed:', e)
+        return None
 
 def get_time_played_by_level():
     try:
-        conn = sqlite3.connect(DB_PATH)
-        cur = conn.cursor()
-        try:
-            cur.execute("SELECT level, COALESCE(SUM(duration_sec),0), COUNT(*) FROM scores GROUP BY level ORDER BY 2 DESC")
-            return cur.fetchall()
-        except Exception:
-            return []
-    finally:
-        try:
-            conn.close()
-        except Exception:
-            pass
-
-# Ensure scores database exists
-init_db()
+        return leaderboard.time_played_by_level()
+    except Exception:
+        return []
+
+# One connection for the whole session; the schema is migrated once here, and
+# the screens that list scores read them from memory (score_store.py)
+score_store, score_writer, leaderboard = open_score_store()
 
 def render_text_centered(text, font_obj, color, y, outline=True):
-    surf = font_obj.render(text, True, color)
-    x = WIDTH//2 - surf.get_width()//2
-    if outline:
-        for ox, oy in [(-2,0),(2,0),(0,-2),(0,2)]:
-            screen.blit(font_obj.render(text, True, (0,0,0)), (x+ox, y+oy))
-    screen.blit(surf, (x, y))
-    return surf.get_rect(topleft=(x, y))
+    surf, text_rect = text_cache.get(font_obj, text, color, 'outline' if outline else None)
+    x = WIDTH//2 - text_rect.width//2
+    screen.blit(surf, (x - text_rect.x, y - text_rect.y))
+    return pygame.Rect(x, y, text_rect.width, text_rect.height)
 
 # Load PNG images with 3D effects
 try:
@@ -198,12 +199,13 @@ score = 0
 lives = 3
 object_speed = 3
 spawn_rate = 30
-objects = []
+objects = ObjectStore()  # falling objects, see falling_objects.py
 frame_count = 0
 game_state = 'main_menu'  # New distinct main menu before difficulty selection
 selected_difficulty = None
 main_menu_index = 0  # Tracks which button is selected on the main menu
 score_saved = False  # avoid saving the same score multiple times per session
+placing = None       # (overall, difficulty) rank of the last saved score
 player_name = ''
 name_input_text = ''
 session_start_time = 0.0
@@ -251,7 +253,7 @@ UI_BACKDROP_TINT = (30, 20, 10)
 
 MAIN_MENU_BUTTONS = ["START", "LEADERBOARD", "OPTIONS", "CREDITS", "EXIT"]
 
-def draw_main_menu(selected_index: int):
+def _render_main_menu(selected_index: int):
     # Draw background image or tinted fallback
     if ui_bg:
         screen.blit(ui_bg, (0, 0))
@@ -288,38 +290,19 @@ def draw_main_menu(selected_index: int):
 
     help_text = small_font.render('Use UP/DOWN + ENTER (Esc to Quit)', True, (220, 200, 180))
     screen.blit(help_text, (WIDTH//2 - help_text.get_width()//2, HEIGHT - 60))
-    pygame.display.flip()
+
+def draw_main_menu(selected_index: int):
+    screen_cache.present('main_menu', selected_index, lambda: _render_main_menu(selected_index))
 
 def draw_game_background(frame_count: int, config):
     """Draw the in-game background using the UI background image if available,
     otherwise fall back to the legacy procedural gradient lines.
-    A subtle animated vertical oscillation and difficulty tint are applied.
+    A subtle animated vertical oscillation and difficulty tint are applied;
+    everything is pre-composited by the background engine (backgrounds.py).
+    The whole screen is marked dirty whenever the background moved.
     """
-    if ui_bg:
-        # Slight vertical float to give life
-        offset = int(5 * math.sin(frame_count * 0.01))
-        screen.blit(ui_bg, (0, offset))
-        if offset > 0:
-            # Fill gap at top when image shifts down
-            screen.blit(ui_bg, (0, offset - HEIGHT))
-        # Difficulty tint overlay
-        tint_color = config['bg_color'] if config else (0, 0, 0)
-        tint_surf = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-        # Light alpha so art shows through
-        tint_surf.fill((*tint_color, 60))
-        screen.blit(tint_surf, (0, 0))
-        # Foreground grass parallax (slower vertical oscillation) if available
-        if grass_layer:
-            g_offset = int(3 * math.sin(frame_count * 0.006))
-            g_rect = grass_layer.get_rect(midbottom=(WIDTH//2, HEIGHT + g_offset))
-            screen.blit(grass_layer, g_rect)
-    else:
-        # Fallback to previous animated background
-        bg_color = config['bg_color'] if config else (34, 139, 34)
-        screen.fill(bg_color)
-        for y in range(0, HEIGHT, 4):
-            green_val = int(bg_color[1] + 20 * math.sin((y + frame_count) * 0.01))
-            pygame.draw.line(screen, (bg_color[0], green_val, bg_color[2]), (0, y), (WIDTH, y))
+    if background.draw(screen, frame_count, config):
+        dirty.full()
 
 # Difficulty configurations
 DIFFICULTY_CONFIG = {
@@ -352,7 +335,11 @@ DIFFICULTY_CONFIG = {
     }
 }
 
-def draw_menu(paused=False):
+# One pre-tinted background per difficulty, built up front
+background = BackgroundEngine((WIDTH, HEIGHT), ui_bg, grass_layer,
+                              [cfg['bg_color'] for cfg in DIFFICULTY_CONFIG.values()])
+
+def _render_menu(paused=False):
     # Background for difficulty selection or pause overlay
     if not paused:
         if ui_bg:
@@ -446,7 +433,13 @@ def draw_menu(paused=False):
     
     quit_text = font.render('Q: Quit', True, (255, 255, 255))
     screen.blit(quit_text, (WIDTH//2 - quit_text.get_width()//2, HEIGHT - 50))
-    pygame.display.flip()
+
+def draw_menu(paused=False):
+    if paused:
+        # Drawn over the game as it was when paused, so a stored copy goes stale
+        screen_cache.present('paused', (selected_difficulty, score, lives), lambda: _render_menu(True), keep=False)
+    else:
+        screen_cache.present('menu', selected_difficulty, lambda: _render_menu(False))
 
 def format_duration(seconds: int) -> str:
     try:
@@ -457,26 +450,26 @@ def format_duration(seconds: int) -> str:
     h, m = divmod(m, 60)
     return f"{h:d}:{m:02d}:{s:02d}" if h else f"{m:02d}:{s:02d}"
 
-def draw_leaderboard():
+def _render_leaderboard():
     screen.fill((25, 25, 35))
     title = font.render('LEADERBOARD', True, (255, 230, 180))
     screen.blit(title, (WIDTH//2 - title.get_width()//2, 40))
 
-    # Top 5 scores
-    try:
-        top5 = get_top_scores(5)
-    except Exception:
-        top5 = []
-    header = small_font.render('Top 5 Scores', True, (230, 210, 200))
+    # One page of the ranking (PAGE UP / PAGE DOWN)
+    page = len(leaderboard_cursors) - 1
+    rows = leaderboard_page[1]
+    first = page * LEADERBOARD_PAGE_SIZE
+    heading = 'Top Scores' if page == 0 else f'Scores {first + 1}-{first + max(1, len(rows))}'
+    header = small_font.render(heading, True, (230, 210, 200))
     screen.blit(header, (WIDTH//2 - header.get_width()//2, 100))
     y = 130
-    for i, row in enumerate(top5):
+    for i, row in enumerate(rows):
         if len(row) >= 5:
             name, s, lvl, dur, created = row
-            line_txt = f"{i+1}. {name[:12]:<12}  {s:>3}  [{lvl}]  {format_duration(dur)}"
+            line_txt = f"{first+i+1}. {name[:12]:<12}  {s:>3}  [{lvl}]  {format_duration(dur)}"
         else:
             name, s, created = row
-            line_txt = f"{i+1}. {name[:12]:<12}  {s:>3}"
+            line_txt = f"{first+i+1}. {name[:12]:<12}  {s:>3}"
         line = small_font.render(line_txt, True, (220,220,220))
         screen.blit(line, (WIDTH//2 - line.get_width()//2, y + i*26))
 
@@ -490,11 +483,27 @@ def draw_leaderboard():
         ln = small_font.render(f"{lvl.title():<7}  {format_duration(total_sec)}  ({cnt} runs)", True, (210,210,210))
         screen.blit(ln, (WIDTH//2 - ln.get_width()//2, y2 + 30 + j*24))
 
-    back = small_font.render('Press ESC or M to return', True, (200, 200, 200))
+    back = small_font.render('PAGE UP / PAGE DOWN to scroll   |   ESC or M to return', True, (200, 200, 200))
     screen.blit(back, (WIDTH//2 - back.get_width()//2, HEIGHT - 60))
-    pygame.display.flip()
 
-def draw_name_entry(current_text: str):
+LEADERBOARD_PAGE_SIZE = 5
+leaderboard_cursors = [None]  # keyset cursor of every page down to the one shown
+leaderboard_page = None       # (key, rows, next page cursor) of the page shown
+
+def draw_leaderboard():
+    global leaderboard_page
+    key = (len(leaderboard_cursors), scores_version)
+    if leaderboard_page is None or leaderboard_page[0] != key:
+        leaderboard_page = (key, *get_scores_page(leaderboard_cursors[-1], LEADERBOARD_PAGE_SIZE))
+    screen_cache.present('leaderboard', key, _render_leaderboard)
+
+def scroll_leaderboard(step):
+    if step > 0 and leaderboard_page and leaderboard_page[2]:
+        leaderboard_cursors.append(leaderboard_page[2])
+    elif step < 0 and len(leaderboard_cursors) > 1:
+        leaderboard_cursors.pop()
+
+def _render_name_entry(current_text: str):
     screen.fill((20, 25, 35))
     title = font.render('ENTER YOUR NAME', True, (255, 230, 180))
     screen.blit(title, (WIDTH//2 - title.get_width()//2, 80))
@@ -517,9 +526,11 @@ def draw_name_entry(current_text: str):
     screen.blit(note, (WIDTH//2 - note.get_width()//2, 320))
     hint = small_font.render('ENTER: Continue   |   ESC: Back to Menu', True, (200, 200, 200))
     screen.blit(hint, (WIDTH//2 - hint.get_width()//2, HEIGHT - 80))
-    pygame.display.flip()
 
-def draw_game_over():
+def draw_name_entry(current_text: str):
+    screen_cache.present('name_entry', current_text, lambda: _render_name_entry(current_text))
+
+def _render_game_over():
     screen.fill((40, 20, 20))
     game_over_text = font.render('GAME OVER', True, (255, 100, 100))
     screen.blit(game_over_text, (WIDTH//2 - game_over_text.get_width()//2, 200))
@@ -529,6 +540,12 @@ def draw_game_over():
     
     difficulty_text = small_font.render(f'Difficulty: {selected_difficulty.title()}', True, (200, 200, 200))
     screen.blit(difficulty_text, (WIDTH//2 - difficulty_text.get_width()//2, 290))
+
+    if placing:
+        overall, on_level = placing
+        placed = small_font.render(f'You placed #{overall}  (#{on_level} on {selected_difficulty.title()})',
+                                   True, (255, 230, 150))
+        screen.blit(placed, (WIDTH//2 - placed.get_width()//2, 318))
     
     restart_text = font.render('R: Restart | M: Menu | Q: Quit', True, (255, 255, 255))
     screen.blit(restart_text, (WIDTH//2 - restart_text.get_width()//2, 350))
@@ -551,13 +568,84 @@ def draw_game_over():
     except Exception as e:
         err = small_font.render(f"Scores unavailable: {e}", True, (255, 180, 180))
         screen.blit(err, (WIDTH//2 - err.get_width()//2, 400))
-    pygame.display.flip()
 
-# Webcam setup
-cap = cv2.VideoCapture(0)
+def draw_game_over():
+    key = (score, selected_difficulty, scores_version, placing)
+    screen_cache.present('game_over', key, _render_game_over)
+
+def _render_options():
+    # Simple placeholder options screen
+    screen.fill((25, 25, 40))
+    txt = font.render('OPTIONS', True, (240, 240, 240))
+    screen.blit(txt, (WIDTH//2 - txt.get_width()//2, 80))
+    setting = 'Auto' if quality.auto else quality.settings['name'].title()
+    quality_msg = small_font.render(f'< Quality: {setting} >', True, (255, 230, 150))
+    screen.blit(quality_msg, (WIDTH//2 - quality_msg.get_width()//2, 200))
+    if quality.auto:
+        current = small_font.render(f"now: {quality.settings['name']}", True, (170, 170, 190))
+        screen.blit(current, (WIDTH//2 - current.get_width()//2, 240))
+    hint = small_font.render('LEFT / RIGHT to change', True, (200, 200, 200))
+    screen.blit(hint, (WIDTH//2 - hint.get_width()//2, 300))
+    back_msg = small_font.render('Press ESC to Main Menu', True, (200, 200, 200))
+    screen.blit(back_msg, (WIDTH//2 - back_msg.get_width()//2, HEIGHT - 100))
+
+def draw_options():
+    screen_cache.present('options', (quality.auto, quality.level), _render_options)
+
+def cycle_quality(step):
+    """Step the OPTIONS quality choice through Auto and each fixed level."""
+    choices = [None] + list(range(len(QUALITY_LEVELS)))
+    current = None if quality.auto else quality.level
+    quality.set(choices[(choices.index(current) + step) % len(choices)])
+    apply_quality()
+
+def _render_credits():
+    screen.fill((40, 25, 25))
+    txt = font.render('CREDITS', True, (255, 230, 180))
+    screen.blit(txt, (WIDTH//2 - txt.get_width()//2, 70))
+    lines = [
+        'Game: Banana Rush',
+        'Concept: You',
+        'Programming: (placeholder)',
+        'Art / UI: (placeholder)',
+        'Press ESC to return'
+    ]
+    for i, line in enumerate(lines):
+        lsurf = small_font.render(line, True, (230, 210, 200))
+        screen.blit(lsurf, (WIDTH//2 - lsurf.get_width()//2, 160 + i * 40))
+
+def draw_credits():
+    screen_cache.present('credits', None, _render_credits)
+
+# Hand / pointer input (webcam + MediaPipe unless --input says otherwise)
+try:
+    input_backend = create_backend(args.input, WIDTH, HEIGHT)
+except ValueError as e:
+    parser.error(str(e))
+if args.record and not input_backend.records_landmarks:
+    parser.error('--record needs a landmark input (mediapipe or video)')
+
+# A replay reuses the seed it was recorded with so the same objects spawn
+seed = args.seed
+if seed is None and isinstance(input_backend, ReplayBackend):
+    seed = input_backend.seed
+if seed is None and args.record:
+    seed = random.randrange(2**31)
+if seed is not None:
+    random.seed(seed)
+landmark_recorder = LandmarkRecorder(args.record, seed) if args.record else None
+
+# Per-stage timing: the first group is measured in the main loop, the second
+# comes from each inference result's timestamps (capture -> worker pickup ->
+# crop/convert -> landmarks -> picked up by the game -> on screen)
+PROFILE_STAGES = ['input', 'simulate', 'background', 'objects', 'particles', 'pointer', 'hud', 'flip', 'frame',
+                  'camera_to_worker', 'convert', 'inference', 'result_wait', 'end_to_end']
+profiler = FrameProfiler(PROFILE_STAGES, dump_path=args.profile)
+show_profile = False  # F3 toggles the timing overlay during play
+profile_font = pygame.font.SysFont('consolas,dejavusansmono,monospace', 16)
 
 # Enhanced object creation with difficulty-based properties
-def random_object():
+def spawn_random_object(y=-80):
     if not selected_difficulty:
         kind = 'banana'  # Default
     else:
@@ -572,181 +660,156 @@ def random_object():
         kind = random.choices(['banana', 'coconut', 'bomb'], weights=weights)[0]
     
     x = random.randint(80, WIDTH-80)
-    y = -80
-    return {
-        'kind': kind, 
-        'x': x, 
-        'y': y, 
-        'radius': 40,
-        'caught': False,
-        'rotation': random.randint(0,360),  # Used for non-frame objects
-        'rotation_speed': random.uniform(2, 8),
-        'scale': random.uniform(0.8, 1.2),
-        'wobble_phase': random.uniform(0, 2*math.pi),
-        'fall_speed': random.uniform(0.8, 1.2),
-        'swing': random.uniform(-2, 2),
-        'anim_index': 0,
-        'anim_counter': 0
-    }
-
-# Enhanced 3D drawing function (same as before)
-def draw_object(obj):
+    objects.spawn(kind, x, y, radius=40,
+                  rotation=random.randint(0, 360),  # Used for non-frame objects
+                  rotation_speed=random.uniform(2, 8),
+                  scale=random.uniform(0.8, 1.2),
+                  wobble_phase=random.uniform(0, 2*math.pi),
+                  fall_speed=random.uniform(0.8, 1.2),
+                  swing=random.uniform(-2, 2))
+
+# Enhanced 3D drawing function; movement and animation happen in simulate_step()
+def draw_object(kind, x, y, radius, rotation, scale, wobble_phase, anim_index):
     if not images_loaded:
         # Fallback to colored circles
-        color = BANANA_COLOR if obj['kind']=='banana' else COCONUT_COLOR if obj['kind']=='coconut' else BOMB_COLOR
-        pygame.draw.circle(screen, color, (int(obj['x']), int(obj['y'])), obj['radius'])
+        color = BANANA_COLOR if kind == BANANA else COCONUT_COLOR if kind == COCONUT else BOMB_COLOR
+        dirty.add(pygame.draw.circle(screen, color, (int(x), int(y)), int(radius)))
         return
     
-    # Update 3D animation properties
-    obj['rotation'] += obj['rotation_speed']
-    obj['wobble_phase'] += 0.1
-    obj['x'] += obj['swing'] * 0.5
-    
-    # Keep objects within screen bounds
-    if obj['x'] < 40:
-        obj['x'] = 40
-        obj['swing'] = abs(obj['swing'])
-    elif obj['x'] > WIDTH - 40:
-        obj['x'] = WIDTH - 40
-        obj['swing'] = -abs(obj['swing'])
-    
     # Select the appropriate image
-    if obj['kind'] == 'banana':
-        base_img = banana_img
-    elif obj['kind'] == 'coconut':
-        base_img = coconut_img
+    if kind == BANANA:
+        base_img, sprite_key = banana_img, 'banana'
+    elif kind == COCONUT:
+        base_img, sprite_key = coconut_img, 'coconut'
     else:  # bomb
         if bomb_frames:
-            # Simple frame animation
-            obj['anim_counter'] += 1
-            if obj['anim_counter'] >= 5:  # frame delay
-                obj['anim_counter'] = 0
-                obj['anim_index'] = (obj['anim_index'] + 1) % len(bomb_frames)
-            base_img = bomb_frames[obj['anim_index']]
+            base_img, sprite_key = bomb_frames[anim_index], ('bomb', anim_index)
         else:
-            base_img = bomb_img
+            base_img, sprite_key = bomb_img, 'bomb'
     
-    # Apply wobble effect (skip wobble scaling for bombs to keep constant size)
-    if obj['kind'] == 'bomb':
-        current_scale = obj['scale']  # constant
+    # Apply wobble effect (skip wobble scaling for bombs to keep constant size,
+    # and at lower quality levels, where it only multiplies sprite sizes)
+    if kind == BOMB or not quality.settings['wobble']:
+        current_scale = scale  # constant
     else:
-        wobble_scale = 1.0 + 0.1 * math.sin(obj['wobble_phase'])
-        current_scale = obj['scale'] * wobble_scale
+        wobble_scale = 1.0 + 0.1 * math.sin(wobble_phase)
+        current_scale = scale * wobble_scale
     
     # Scale the image (coconut slightly smaller base size)
     base_size = 80
-    if obj['kind'] == 'coconut':
+    if kind == COCONUT:
         base_size = 60  # reduced size for coconut
     scaled_size = int(base_size * current_scale)
     if scaled_size > 0:
-        scaled_img = pygame.transform.scale(base_img, (scaled_size, scaled_size))
-        # Always rotate (including bombs) for a spinning fall effect
-        rotated_img = pygame.transform.rotate(scaled_img, obj['rotation'])
-        
-        # Create shadow effect
-        shadow_img = rotated_img.copy()
-        shadow_img.fill((0, 0, 0, 80), special_flags=pygame.BLEND_RGBA_MULT)
+        # Scaled, rotated (including bombs, for a spinning fall effect) and
+        # shadowed once per size/angle bucket, see render_cache.py
+        rotated_img, shadow_img = sprite_cache.get(sprite_key, base_img, scaled_size, rotation)
         
         # Position the images
-        img_rect = rotated_img.get_rect(center=(int(obj['x']), int(obj['y'])))
-        shadow_rect = shadow_img.get_rect(center=(int(obj['x'] + 4), int(obj['y'] + 4)))
+        img_rect = rotated_img.get_rect(center=(int(x), int(y)))
+        shadow_rect = shadow_img.get_rect(center=(int(x + 4), int(y + 4)))
         
         # Draw shadow first, then main image
-        screen.blit(shadow_img, shadow_rect)
-        screen.blit(rotated_img, img_rect)
+        if quality.settings['shadows']:
+            dirty.add(screen.blit(shadow_img, shadow_rect).union(screen.blit(rotated_img, img_rect)))
+        else:
+            dirty.add(screen.blit(rotated_img, img_rect))
         
         # Add glint effect
-        if obj['rotation'] % 360 < 5:
-            glint_pos = (int(obj['x'] - scaled_size//4), int(obj['y'] - scaled_size//4))
-            pygame.draw.circle(screen, (255, 255, 255, 150), glint_pos, 5)
-
-# Particle system for slice effects
-particles = []
+        if rotation % 360 < 5:
+            glint_pos = (int(x - scaled_size//4), int(y - scaled_size//4))
+            dirty.add(pygame.draw.circle(screen, (255, 255, 255, 150), glint_pos, 5))
+
+def draw_objects(alpha=1.0):
+    """Draw every object alpha of the way from its previous step to its last one."""
+    n = len(objects)
+    x = lerp(objects.prev_x[:n], objects.x[:n], alpha)
+    y = lerp(objects.prev_y[:n], objects.y[:n], alpha)
+    rotation = lerp(objects.prev_rotation[:n], objects.rotation[:n], alpha)
+    wobble_phase = objects.wobble_phase[:n] - (1.0 - alpha) * WOBBLE_RATE
+    columns = (objects.kind[:n], x, y, objects.radius[:n], rotation,
+               objects.scale[:n], wobble_phase, objects.anim_index[:n])
+    for fields in zip(*(column.tolist() for column in columns)):
+        draw_object(*fields)
+
+sprite_cache = SpriteCache()
+catch_detector = CatchDetector()
+
+# Particle system for slice effects (particles.py)
+particles = ParticleEngine({
+    'banana': [(255, 255, 0), (255, 200, 0), (255, 150, 0)],
+    'coconut': [(139, 69, 19), (160, 82, 45), (210, 180, 140)],
+    'bomb': [(255, 0, 0), (255, 100, 0), (255, 150, 0)]
+}, seed=seed)
 
 def create_slice_particles(x, y, obj_kind):
-    colors = {
-        'banana': [(255, 255, 0), (255, 200, 0), (255, 150, 0)],
-        'coconut': [(139, 69, 19), (160, 82, 45), (210, 180, 140)],
-        'bomb': [(255, 0, 0), (255, 100, 0), (255, 150, 0)]
-    }
-    
-    for _ in range(10):
-        particle = {
-            'x': x + random.randint(-20, 20),
-            'y': y + random.randint(-20, 20),
-            'vx': random.uniform(-5, 5),
-            'vy': random.uniform(-8, -2),
-            'life': 30,
-            'color': random.choice(colors[obj_kind])
-        }
-        particles.append(particle)
-
-def update_particles():
-    global particles
-    for particle in particles[:]:
-        particle['x'] += particle['vx']
-        particle['y'] += particle['vy']
-        particle['vy'] += 0.3
-        particle['life'] -= 1
-        
-        if particle['life'] <= 0:
-            particles.remove(particle)
-        else:
-            size = max(1, particle['life'] // 6)
-            pygame.draw.circle(screen, particle['color'], 
-                             (int(particle['x']), int(particle['y'])), size)
+    particles.emit(x, y, obj_kind, 10)
+
+# Detail level: stepped down/up from frame times, or fixed in OPTIONS (quality.py)
+quality = QualityController()
+
+def apply_quality():
+    settings = quality.settings
+    sprite_cache.set_angle_step(settings['angle_step'])
+    particles.limit = settings['particles'] or particles.capacity
+    background.animate = settings['parallax']
+
+apply_quality()
 
 def reset_game():
-    global score, lives, objects, frame_count, score_saved
+    global score, lives, frame_count, score_saved, catch_from
+    timestep.reset()
     if selected_difficulty:
         config = DIFFICULTY_CONFIG[selected_difficulty]
         lives = config['lives']
         score = 0
-        objects = []
+        objects.clear()
         frame_count = 0
         score_saved = False
+        catch_from = None
 
 # Finger sprite (animated) setup
 finger_frames = []
-finger_frame_index = 0
-finger_anim_counter = 0
-FINGER_ANIM_DELAY = 6  # frames between animation steps
+FINGER_ANIM_DELAY = 6  # simulation steps between animation frames
+# Sparkle jitter has its own generator: drawing must not consume the seeded
+# game RNG, or the number of frames per step would change what spawns
+sparkle_random = random.Random()
 
 # Pointer virtual position & jump control
 pointer_x = WIDTH // 2
 pointer_y_base = int(HEIGHT * 0.75)  # 3/4 down screen
 pointer_y = pointer_y_base
+prev_pointer_y = pointer_y  # pointer_y one simulation step earlier, for drawing
 jump_active = False
 jump_velocity = 0.0
 JUMP_STRENGTH = -18.0
 GRAVITY = 1.0
 JUMP_COOLDOWN_FRAMES = 25
 last_jump_frame = -999
-prev_raw_tip_y = None
-prev_raw_tip_frame = -999
-JUMP_TRIGGER_DELTA = 50  # px upward within recent frames triggers jump
-JUMP_TRIGGER_WINDOW = 8  # frames window to consider rapid upward motion
 
-def update_pointer(monkey_tip_raw, frame_count):
+# Smooths the raw fingertip and predicts it between inference results
+pointer_filter = PointerFilter()
+
+def update_pointer(tip_estimate, jump_gesture, frame_count):
     """Update constrained pointer position.
-    Horizontal follows raw x; vertical fixed unless jumping. Jump triggers when
-    raw finger y is raised above top threshold quickly while pointing.
+    Horizontal follows the filtered fingertip x; vertical fixed unless jumping.
+    Jump triggers on the input's upward-flick gesture or when the fingertip
+    is raised above the top threshold while pointing.
     """
-    global pointer_x, pointer_y, jump_active, jump_velocity, last_jump_frame, prev_raw_tip_y, prev_raw_tip_frame
-    # Follow horizontal smoothly
-    if monkey_tip_raw:
-        target_x = monkey_tip_raw[0]
-        pointer_x += int((target_x - pointer_x) * 0.25)  # smoothing
+    global pointer_x, pointer_y, jump_active, jump_velocity, last_jump_frame
+    # Follow horizontal (already smoothed and extrapolated by pointer_filter)
+    if tip_estimate:
+        pointer_x = int(min(max(tip_estimate[0], 0), WIDTH))
 
     # Jump initiation conditions
-    if monkey_tip_raw and not jump_active and (frame_count - last_jump_frame > JUMP_COOLDOWN_FRAMES):
-        # 1) Rapid upward motion (more forgiving and closer to previous behavior)
-        if prev_raw_tip_y is not None and (prev_raw_tip_y - monkey_tip_raw[1] >= JUMP_TRIGGER_DELTA) and (frame_count - prev_raw_tip_frame <= JUMP_TRIGGER_WINDOW):
+    if tip_estimate and not jump_active and (frame_count - last_jump_frame > JUMP_COOLDOWN_FRAMES):
+        # 1) Rapid upward motion (debounced flick detection in the input backend)
+        if jump_gesture:
             jump_active = True
             jump_velocity = JUMP_STRENGTH
             last_jump_frame = frame_count
         # 2) Or absolute top-third threshold
-        elif monkey_tip_raw[1] < HEIGHT * 0.33:
+        elif tip_estimate[1] < HEIGHT * 0.33:
             jump_active = True
             jump_velocity = JUMP_STRENGTH
             last_jump_frame = frame_count
@@ -761,13 +824,26 @@ def update_pointer(monkey_tip_raw, frame_count):
     else:
         pointer_y = pointer_y_base
 
-    # Track last raw tip position for velocity-style detection
-    if monkey_tip_raw:
-        prev_raw_tip_y = monkey_tip_raw[1]
-        prev_raw_tip_frame = frame_count
-
     return (pointer_x, int(pointer_y))
 
+def draw_profile_overlay():
+    """Stage timings (ms, p50/p95/p99) in the top-right corner."""
+    rows = profiler.report()
+    line_h = profile_font.get_linesize()
+    x, y = WIDTH - 330, 10
+    panel = pygame.Surface((324, line_h * (len(rows) + 2) + 8), pygame.SRCALPHA)
+    panel.fill((0, 0, 0, 160))
+    dirty.add(screen.blit(panel, (x - 6, y - 4)))
+    header = f"{'stage (ms)':<16}{'p50':>6}{'p95':>7}{'p99':>7}"
+    screen.blit(profile_font.render(header, True, (255, 255, 0)), (x, y))
+    for stage, p50, p95, p99 in rows:
+        y += line_h
+        line = f'{stage:<16}{p50:6.1f}{p95:7.1f}{p99:7.1f}'
+        screen.blit(profile_font.render(line, True, (255, 255, 255)), (x, y))
+    y += line_h
+    screen.blit(profile_font.render(f'quality: {quality.label}', True, (255, 255, 0)), (x, y))
+
+
 def load_finger_sprite():
     global finger_frames
     # Try animated GIF first
@@ -804,47 +880,127 @@ def load_finger_sprite():
         finger_frames = [surf]
 
 def draw_finger_sprite(pos, frame_count):
-    global finger_frame_index, finger_anim_counter
     if not finger_frames:
         load_finger_sprite()
-    finger_anim_counter += 1
-    if finger_anim_counter >= FINGER_ANIM_DELAY:
-        finger_anim_counter = 0
-        finger_frame_index = (finger_frame_index + 1) % len(finger_frames)
-    frame = finger_frames[finger_frame_index]
+    # Animate on simulation steps so the speed doesn't depend on the frame rate
+    frame = finger_frames[(frame_count // FINGER_ANIM_DELAY) % len(finger_frames)]
     rect = frame.get_rect(center=pos)
-    screen.blit(frame, rect)
+    dirty.add(screen.blit(frame, rect))
     # Optional sparkle effect (reuse existing timing)
     if frame_count % 10 == 0 and len(finger_frames) == 1:
-        sx = pos[0] + random.randint(-10, 10)
-        sy = pos[1] + random.randint(-10, 10)
-        pygame.draw.circle(screen, (255, 255, 255), (sx, sy), 2)
+        sx = pos[0] + sparkle_random.randint(-10, 10)
+        sy = pos[1] + sparkle_random.randint(-10, 10)
+        dirty.add(pygame.draw.circle(screen, (255, 255, 255), (sx, sy), 2))
+
+def simulate_step(config, tip_estimate, jump_gesture, pointing):
+    """One fixed step of game logic: spawning, movement, misses, pointer jump
+    physics, catches and particles. Nothing is drawn here."""
+    global frame_count, score, lives, catch_from, prev_pointer_y
+    frame_count += 1
+    
+    # Spawn objects based on difficulty
+    if frame_count % config['spawn_rate'] == 0:
+        spawn_random_object()
+    # --stress keeps the screen filled with objects to load the object path
+    while len(objects) < args.stress:
+        spawn_random_object(y=random.uniform(-80, HEIGHT))
+        
+    # Move and animate all objects with difficulty-based speed
+    objects.step(config['object_speed'], WIDTH, animate=images_loaded, bomb_frames=len(bomb_frames))
+    n = len(objects)
+    
+    # Check for missed bananas in hard mode
+    if config['miss_penalty']:
+        missed = (objects.kind[:n] == BANANA) & (objects.y[:n] >= HEIGHT) & ~objects.caught[:n]
+        for i in np.flatnonzero(missed):
+            lives -= 1
+            create_slice_particles(objects.x[i], HEIGHT - 50, 'bomb')  # Red particles for penalty
+        objects.remove(missed)
+        n = len(objects)
+
+    # Pointer jump physics
+    prev_pointer_y = pointer_y
+    tip = update_pointer(tip_estimate, jump_gesture, frame_count)
+    if pointing:
+        # Check for catching objects along the pointer's path since the last step (collision.py)
+        sweep = (*(catch_from or tip), *tip)
+        hits, _ = catch_detector.catches(objects.x[:n], objects.y[:n], objects.radius[:n], [sweep],
+                                         active=~objects.caught[:n])
+        catch_from = tip
+        objects.caught[hits] = True
+        for i in hits:
+            kind = objects.kind[i]
+            
+            # Create slice particles
+            create_slice_particles(objects.x[i], objects.y[i], KINDS[kind])
+            
+            # Apply difficulty-based scoring and penalties
+            if kind == BANANA:
+                score += 1
+            elif kind == COCONUT:
+                penalty = config['coconut_penalty']
+                if penalty == 'game_over':
+                    lives = 0
+                elif penalty == 'life':
+                    lives -= 1
+                else:  # Score reduction
+                    score = max(0, score - penalty)
+            elif kind == BOMB:
+                penalty = config['bomb_penalty']
+                if penalty == 'game_over':
+                    lives = 0
+                else:
+                    lives -= penalty
+    else:
+        catch_from = None
+        
+    # Remove off-screen and caught objects
+    objects.remove((objects.y[:n] >= HEIGHT + 100) | objects.caught[:n])
+    particles.update()
 
 # Main game loop
 running = True
+monkey_tip = None
+catch_from = None  # where the pointer was on the last step it could catch
+pending_jump = False
+timestep = FixedTimestep()  # game logic runs at SIM_RATE steps per second
+replay_frame_ms = []
 while running:
-    # Webcam frame
-    ret, frame = cap.read()
-    if not ret:
+    if isinstance(input_backend, ReplayBackend):
+        replay_frame_ms.append(clock.get_rawtime())
+    profiler.begin_frame()
+    raw_tip, hand_pointing, hand_closed = input_backend.poll(game_state)
+    if input_backend.finished:
         break
-    frame = cv2.flip(frame, 1)
-    rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-    results = hands.process(rgb)
-    monkey_tip = None
-    hand_pointing = False
-    hand_closed = False
-    raw_tip = None
-    
-    if results.multi_hand_landmarks:
-        for hand_landmarks in results.multi_hand_landmarks:
-            lm = hand_landmarks.landmark
-            h, w, _ = frame.shape
-            tip_x, tip_y = int(lm[8].x * WIDTH), int(lm[8].y * HEIGHT)
-            if is_index_finger_up(lm):
-                raw_tip = (tip_x, tip_y)
-                hand_pointing = True
-            if is_hand_closed(lm):
-                hand_closed = True
+    tick_time = input_backend.tick_time
+    result = getattr(input_backend, 'last_result', None)
+    if result is not None:
+        profiler.record('camera_to_worker', result[RESULT_START_TIME] - result[RESULT_CAPTURE_TIME])
+        profiler.record('convert', result[RESULT_CONVERTED_TIME] - result[RESULT_START_TIME])
+        profiler.record('inference', result[RESULT_DONE_TIME] - result[RESULT_CONVERTED_TIME])
+        profiler.record('result_wait', tick_time - result[RESULT_DONE_TIME])
+        # Camera -> this tick, in the backend's clock (recorded time on replay);
+        # this tick -> flip is added once the frame is on screen
+        result_age = tick_time - result[RESULT_CAPTURE_TIME]
+    else:
+        result_age = None
+    if raw_tip:
+        pointer_filter.update(raw_tip, input_backend.sample_time)
+    else:
+        pointer_filter.reset()
+
+    if landmark_recorder:
+        # Peek at this tick's key presses (put back for the state handlers)
+        key_events = pygame.event.get(pygame.KEYDOWN)
+        for event in key_events:
+            pygame.event.post(event)
+        landmark_recorder.write_tick(tick_time, input_backend.last_result, hand_pointing, hand_closed,
+                                     input_backend.stalled, [(event.key, event.unicode) for event in key_events])
+
+    if pygame.event.get(EXPOSE_EVENTS):
+        # Redraw everything: a cached screen that didn't change would be skipped
+        screen_cache.invalidate()
+        dirty.full()
 
     if game_state == 'main_menu':
         draw_main_menu(main_menu_index)
@@ -879,8 +1035,14 @@ while running:
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
-            elif event.type == pygame.KEYDOWN and (event.key == pygame.K_ESCAPE or event.key == pygame.K_m):
-                game_state = 'main_menu'
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_ESCAPE or event.key == pygame.K_m:
+                    game_state = 'main_menu'
+                    leaderboard_cursors[1:] = []  # start from the top next time
+                elif event.key in (pygame.K_PAGEDOWN, pygame.K_DOWN):
+                    scroll_leaderboard(1)
+                elif event.key in (pygame.K_PAGEUP, pygame.K_UP):
+                    scroll_leaderboard(-1)
         clock.tick(30)
         continue
 
@@ -910,41 +1072,27 @@ while running:
         continue
 
     if game_state == 'options':
-        # Simple placeholder options screen
-        screen.fill((25, 25, 40))
-        txt = font.render('OPTIONS', True, (240, 240, 240))
-        screen.blit(txt, (WIDTH//2 - txt.get_width()//2, 80))
-        back_msg = small_font.render('Press ESC to Main Menu', True, (200, 200, 200))
-        screen.blit(back_msg, (WIDTH//2 - back_msg.get_width()//2, HEIGHT - 100))
+        draw_options()
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
-            elif event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
-                game_state = 'main_menu'
-        pygame.display.flip()
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_ESCAPE:
+                    game_state = 'main_menu'
+                elif event.key == pygame.K_LEFT:
+                    cycle_quality(-1)
+                elif event.key == pygame.K_RIGHT:
+                    cycle_quality(1)
         clock.tick(30)
         continue
 
     if game_state == 'credits':
-        screen.fill((40, 25, 25))
-        txt = font.render('CREDITS', True, (255, 230, 180))
-        screen.blit(txt, (WIDTH//2 - txt.get_width()//2, 70))
-        lines = [
-            'Game: Banana Rush',
-            'Concept: You',
-            'Programming: (placeholder)',
-            'Art / UI: (placeholder)',
-            'Press ESC to return'
-        ]
-        for i, line in enumerate(lines):
-            lsurf = small_font.render(line, True, (230, 210, 200))
-            screen.blit(lsurf, (WIDTH//2 - lsurf.get_width()//2, 160 + i * 40))
+        draw_credits()
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
             elif event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
                 game_state = 'main_menu'
-        pygame.display.flip()
         clock.tick(30)
         continue
 
@@ -1006,6 +1154,8 @@ while running:
 
     if game_state == 'paused':
         draw_menu(paused=True)
+        catch_from = None  # don't sweep across the pause when play resumes
+        timestep.reset()   # nor simulate the time spent paused
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
@@ -1017,7 +1167,7 @@ while running:
                     game_state = 'main_menu'
                     selected_difficulty = None
                     # Clear active game objects & stats to avoid carry-over
-                    objects = []
+                    objects.clear()
                     score = 0
                     # Lives will be set when a new difficulty is selected
         clock.tick(10)
@@ -1026,70 +1176,37 @@ while running:
     # Get difficulty configuration
     config = DIFFICULTY_CONFIG[selected_difficulty] if selected_difficulty else DIFFICULTY_CONFIG['medium']
     
+    profiler.mark('input')
+
+    # Run the game logic in fixed steps for the time that passed (simulation.py);
+    # a jump gesture waits for the next step if this frame runs none
+    pending_jump = pending_jump or input_backend.jump
+    tip_estimate = pointer_filter.predict(tick_time)
+    for _ in range(timestep.advance(tick_time)):
+        simulate_step(config, tip_estimate, pending_jump, hand_pointing)
+        pending_jump = False
+        if lives <= 0:
+            break
+    alpha = timestep.alpha
+    profiler.mark('simulate')
+
+    # Draw the state alpha of the way from the previous step to the last one
     # New unified game background draw (uses ui_bg if available)
     draw_game_background(frame_count, config)
-
-    if game_state == 'running':
-        frame_count += 1
-        
-        # Spawn objects based on difficulty
-        if frame_count % config['spawn_rate'] == 0:
-            objects.append(random_object())
-            
-        # Move objects with difficulty-based speed
-        for obj in objects:
-            obj['y'] += config['object_speed'] * obj['fall_speed']
-        
-        # Check for missed bananas in hard mode
-        if config['miss_penalty']:
-            for obj in objects[:]:
-                if obj['kind'] == 'banana' and obj['y'] >= HEIGHT and not obj['caught']:
-                    lives -= 1
-                    objects.remove(obj)
-                    create_slice_particles(obj['x'], HEIGHT - 50, 'bomb')  # Red particles for penalty
-            
-        # Remove off-screen objects
-        objects = [obj for obj in objects if obj['y'] < HEIGHT + 100 and not obj['caught']]
+    profiler.mark('background')
 
     # Draw objects with 3D effects
-    for obj in objects:
-        draw_object(obj)
+    draw_objects(alpha)
+    profiler.mark('objects')
 
-    # Update and draw particles
-    update_particles()
+    dirty.add(particles.draw(screen, alpha))
+    profiler.mark('particles')
 
-    # Update & draw constrained pointer (horizontal follow, jump vertical)
-    monkey_tip = update_pointer(raw_tip, frame_count)
+    # Constrained pointer (horizontal follow, jump vertical)
+    monkey_tip = (pointer_x, int(lerp(prev_pointer_y, pointer_y, alpha)))
     if hand_pointing:
         draw_finger_sprite(monkey_tip, frame_count)
-
-        # Check for catching objects (unchanged logic threshold may need adjusting for sprite size)
-        for obj in objects:
-            if not obj['caught']:
-                dist = math.hypot(monkey_tip[0] - obj['x'], monkey_tip[1] - obj['y'])
-                if dist < obj['radius'] + 20:
-                    obj['caught'] = True
-                    
-                    # Create slice particles
-                    create_slice_particles(obj['x'], obj['y'], obj['kind'])
-                    
-                    # Apply difficulty-based scoring and penalties
-                    if obj['kind'] == 'banana':
-                        score += 1
-                    elif obj['kind'] == 'coconut':
-                        penalty = config['coconut_penalty']
-                        if penalty == 'game_over':
-                            lives = 0
-                        elif penalty == 'life':
-                            lives -= 1
-                        else:  # Score reduction
-                            score = max(0, score - penalty)
-                    elif obj['kind'] == 'bomb':
-                        penalty = config['bomb_penalty']
-                        if penalty == 'game_over':
-                            lives = 0
-                        else:
-                            lives -= penalty
+    profiler.mark('pointer')
 
     # Check for game over
     if lives <= 0:
@@ -1101,31 +1218,68 @@ while running:
                     duration = int(time.time() - session_start_time)
             except Exception:
                 duration = 0
-            add_score(player_name or 'YOU', score, selected_difficulty or 'unknown', duration)
+            saved = add_score(player_name or 'YOU', score, selected_difficulty or 'unknown', duration)
+            placing = get_placing(saved) if saved else None
             score_saved = True
         game_state = 'game_over'
 
-    # Draw enhanced HUD
-    for offset in [(2, 2), (1, 1), (0, 0)]:
-        color = (0, 0, 0) if offset != (0, 0) else (255, 255, 255)
-        score_text = font.render(f'Score: {score}', True, color)
-        screen.blit(score_text, (10 + offset[0], 10 + offset[1]))
-        
-        lives_text = font.render(f'Lives: {lives}', True, (255, 100, 100) if offset == (0, 0) else (0, 0, 0))
-        screen.blit(lives_text, (10 + offset[0], 50 + offset[1]))
-        
-        diff_text = small_font.render(f'Difficulty: {selected_difficulty.title() if selected_difficulty else "None"}', True, color)
-        screen.blit(diff_text, (10 + offset[0], 90 + offset[1]))
+    # Draw enhanced HUD (each line comes with its drop shadow from text_cache)
+    hud_lines = [
+        (f'Score: {score}', font, (255, 255, 255), 10),
+        (f'Lives: {lives}', font, (255, 100, 100), 50),
+        (f'Difficulty: {selected_difficulty.title() if selected_difficulty else "None"}', small_font, (255, 255, 255), 90),
+    ]
+    for text, text_font, color, y in hud_lines:
+        dirty.add(screen.blit(text_cache.get(text_font, text, color, 'shadow')[0], (10, y)))
+    if show_profile:
+        draw_profile_overlay()
 
     # Event handling
     for event in pygame.event.get():
         if event.type == pygame.QUIT:
             running = False
-
-    pygame.display.flip()
-    clock.tick(60)
-
-cap.release()
-cv2.destroyAllWindows()
+        elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+            show_profile = not show_profile
+    profiler.mark('hud')
+
+    dirty.present()
+    screen_cache.displaced()
+    flip_time = profiler.mark('flip')
+    if result_age is not None:
+        profiler.record('end_to_end', result_age + flip_time - profiler.frame_start)
+    if quality.update(profiler.end_frame() - profiler.frame_start):
+        apply_quality()
+    clock.tick(args.fps)
+
+input_backend.close()
+if score_writer:
+    score_writer.close()  # write any scores still queued
+if args.stats:
+    print('Input:', input_backend.stats())
+    print('Sprite cache:', sprite_cache.stats())
+    print('Screen cache:', screen_cache.stats())
+    print('Text cache:', text_cache.stats())
+    print('Background:', background.stats())
+    print('Particles:', particles.stats())
+    print('Objects:', objects.stats())
+    print('Catches:', catch_detector.stats())
+    print('Simulation:', timestep.stats())
+    print('Quality:', quality.stats())
+    if leaderboard:
+        print('Leaderboard cache:', leaderboard.stats())
+        print('Score writer:', score_writer.stats())
+    print('Display:', dirty.stats())
+if landmark_recorder:
+    landmark_recorder.close()
+    print(f'Recorded {landmark_recorder.ticks} ticks to {landmark_recorder.path} (seed {seed})')
+if isinstance(input_backend, ReplayBackend):
+    times = sorted(replay_frame_ms[1:]) or [0]
+    print(f'Replayed {input_backend.replay.ticks} ticks: score {score}, lives {lives}, '
+          f'frame ms p50 {times[len(times)//2]} p95 {times[int(len(times)*0.95)]} max {times[-1]}')
+if args.profile:
+    profiler.dump()
+    print(f'Stage timings written to {args.profile}')
+if score_store:
+    score_store.close()
 pygame.quit()
 sys.exit()
\ No newline at end of file
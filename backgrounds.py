@@ -0,0 +1,120 @@
+"""Pre-composited in-game backgrounds.
+
+The game background is the UI image with a light difficulty tint, floating
+a few pixels up and down, plus the grass layer bobbing on its own slower
+cycle. BackgroundEngine builds everything that doesn't move once:
+
+- one opaque tinted copy of the image per difficulty, stacked twice
+  vertically so any float offset is a single blit of a window of it
+- the composed frame (tinted image + grass) for the current offsets, kept
+  in a small LRU so that offsets visited again cost nothing; both float
+  cycles only take a handful of integer values
+- without an image, the procedural gradient as a tall pre-generated strip
+  (built with NumPy, one per line phase) that is scrolled instead of
+  drawing 150 lines per frame
+
+Each frame is then one opaque blit. draw() reports whether the picture
+changed since the last frame so the caller can mark the screen dirty.
+With animate off (a lower quality level) the background holds still, so
+it stops forcing full-screen updates.
+"""
+import math
+from collections import OrderedDict
+
+import numpy as np
+import pygame
+
+FLOAT_AMPLITUDE, FLOAT_RATE = 5, 0.01   # image float: px, radians per frame
+GRASS_AMPLITUDE, GRASS_RATE = 3, 0.006  # grass bob
+TINT_ALPHA = 60                         # light alpha so the art shows through
+GRADIENT_RATE, GRADIENT_DEPTH = 0.01, 20
+GRADIENT_LINE_STEP = 4                  # the fallback gradient colours every 4th row
+FALLBACK_COLOR = (34, 139, 34)
+COMPOSED_FRAMES = 8
+
+
+class BackgroundEngine:
+    def __init__(self, size, image=None, grass=None, tints=()):
+        self.width, self.height = size
+        self.image = image
+        self.grass = grass
+        self._frames = OrderedDict()    # (tint, offset, grass offset) -> composed frame
+        self._strips = {}               # gradient base colour -> strip per line phase
+        self._period = int(round(2 * math.pi / GRADIENT_RATE))
+        self._tinted = {}               # tint colour -> image tinted, stacked twice
+        if image is not None:
+            for tint in tints:
+                self._tinted[tint] = self._build_tinted(tint)
+        self._key = None
+        self.animate = True
+        self.compositions = 0
+
+    def _build_tinted(self, tint):
+        strip = pygame.Surface((self.width, 2 * self.height)).convert()
+        tint_surf = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
+        tint_surf.fill((*tint, TINT_ALPHA))
+        for y in (0, self.height):
+            strip.blit(self.image, (0, y))
+            strip.blit(tint_surf, (0, y))
+        return strip
+
+    def _compose(self, key):
+        tint, offset, g_offset = key
+        frame = self._frames.get(key)
+        if frame is not None:
+            self._frames.move_to_end(key)
+            return frame
+        if len(self._frames) >= COMPOSED_FRAMES:
+            _, frame = self._frames.popitem(last=False)  # reuse the oldest surface
+        else:
+            frame = pygame.Surface((self.width, self.height)).convert()
+        tinted = self._tinted.get(tint)
+        if tinted is None:
+            tinted = self._tinted[tint] = self._build_tinted(tint)
+        # The image shifted down by offset, wrapping around at the top
+        frame.blit(tinted, (0, 0), pygame.Rect(0, (-offset) % self.height, self.width, self.height))
+        if self.grass:
+            frame.blit(self.grass, self.grass.get_rect(midbottom=(self.width // 2, self.height + g_offset)))
+        self._frames[key] = frame
+        self.compositions += 1
+        return frame
+
+    def _gradient_strips(self, base):
+        """Gradient rows for one base colour, as GRADIENT_LINE_STEP strips
+        (one per line phase) tall enough to scroll through a full period."""
+        strips = self._strips.get(base)
+        if strips is None:
+            rows = np.arange(self._period + self.height)
+            green = (base[1] + GRADIENT_DEPTH * np.sin(rows * GRADIENT_RATE)).astype(int)
+            colors = np.empty((len(rows), 3), dtype=np.uint8)
+            colors[:, 0], colors[:, 1], colors[:, 2] = base[0], np.clip(green, 0, 255), base[2]
+            strips = []
+            for phase in range(GRADIENT_LINE_STEP):
+                column = np.where((rows % GRADIENT_LINE_STEP == phase)[:, None], colors, np.array(base, dtype=np.uint8))
+                pixels = np.broadcast_to(column[None], (self.width, len(rows), 3))
+                strips.append(pygame.surfarray.make_surface(pixels).convert())
+            self._strips = {base: strips}  # only the current difficulty's strips are kept
+        return strips
+
+    def draw(self, screen, frame_count, config):
+        """Draw the background for frame_count; True if it differs from the last frame."""
+        if not self.animate:
+            frame_count = 0
+        if self.image:
+            tint = config['bg_color'] if config else (0, 0, 0)
+            offset = int(FLOAT_AMPLITUDE * math.sin(frame_count * FLOAT_RATE))
+            g_offset = int(GRASS_AMPLITUDE * math.sin(frame_count * GRASS_RATE)) if self.grass else 0
+            key = (tint, offset, g_offset)
+            screen.blit(self._compose(key), (0, 0))
+        else:
+            base = config['bg_color'] if config else FALLBACK_COLOR
+            start = frame_count % self._period
+            strip = self._gradient_strips(base)[start % GRADIENT_LINE_STEP]
+            screen.blit(strip, (0, 0), pygame.Rect(0, start, self.width, self.height))
+            key = (base, frame_count)
+        changed = key != self._key
+        self._key = key
+        return changed
+
+    def stats(self):
+        return {'compositions': self.compositions}
@@ -0,0 +1,122 @@
+"""Threaded webcam capture that always holds the newest frame.
+
+cv2.VideoCapture.read() blocks until the camera delivers its next frame, so
+calling it at the top of the game loop paces every screen at the camera rate
+(or stops it entirely when the camera stalls). Here a reader thread owns the
+device and publishes each frame into a single slot; the game loop takes
+whatever is newest without waiting and older frames are simply replaced.
+"""
+import threading
+import time
+
+import cv2
+
+
+class LatestFrameCapture:
+    def __init__(self, source=0, stall_timeout=0.5, realtime=False, loop=False):
+        self.source = source
+        self.stall_timeout = stall_timeout
+        self.realtime = realtime  # pace video files to their frame rate instead of decoding flat out
+        self.loop = loop          # restart video files from the beginning when they end
+        self._cap = cv2.VideoCapture(source)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+        # Frames are decoded into a small ring of reused arrays instead of a
+        # new allocation per read; the newest one is published below
+        self._buffers = [None] * 3
+        self._next_buffer = 0
+
+        # Single-slot buffer: newest frame, its id and capture timestamp
+        self._frame = None
+        self._frame_id = 0
+        self._frame_time = 0.0
+        self._last_read_id = 0
+        self._stalled = False
+
+        self.failed = False
+        self.frames_captured = 0
+        self.frames_dropped = 0   # replaced before the game loop picked them up
+        self.duplicate_reads = 0  # game loop asked again before a new frame arrived
+        self.stalls = 0           # no new frame for longer than stall_timeout
+
+    def start(self):
+        if not self._cap.isOpened():
+            print('Camera not available:', self.source)
+            self.failed = True
+            return self
+        self._thread = threading.Thread(target=self._run, name='camera-capture', daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self):
+        fps = self._cap.get(cv2.CAP_PROP_FPS) if self.realtime else 0
+        frame_interval = 1.0 / fps if fps and fps > 0 else 0.0
+        next_time = time.perf_counter()
+        while not self._stop.is_set():
+            i = self._next_buffer
+            ret, frame = self._cap.read(self._buffers[i])
+            if not ret and self.loop and self.frames_captured:
+                self._cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                ret, frame = self._cap.read(self._buffers[i])
+            if not ret:
+                self.failed = True
+                break
+            self._buffers[i] = frame
+            self._next_buffer = (i + 1) % len(self._buffers)
+            if frame_interval:
+                next_time += frame_interval
+                delay = next_time - time.perf_counter()
+                if delay > 0:
+                    self._stop.wait(delay)
+                else:
+                    next_time = time.perf_counter()
+            now = time.perf_counter()
+            with self._lock:
+                if self._frame_id != self._last_read_id:
+                    self.frames_dropped += 1
+                self._frame = frame
+                self._frame_id += 1
+                self._frame_time = now
+                self.frames_captured += 1
+
+    def read(self):
+        """Return (frame_id, frame, timestamp) for the newest frame without blocking.
+
+        frame is None until the camera delivers its first frame. The same
+        frame_id is returned again when nothing new has arrived since the
+        previous call; callers should skip re-processing it. The array is
+        reused for a later frame, so copy out of it right away (within two
+        camera frames) rather than keeping it.
+        """
+        with self._lock:
+            frame_id, frame, frame_time = self._frame_id, self._frame, self._frame_time
+            if frame_id == self._last_read_id:
+                if frame_id:
+                    self.duplicate_reads += 1
+                    if not self._stalled and time.perf_counter() - frame_time > self.stall_timeout:
+                        self._stalled = True
+                        self.stalls += 1
+            else:
+                self._last_read_id = frame_id
+                self._stalled = False
+        return frame_id, frame, frame_time
+
+    @property
+    def stalled(self):
+        return self._stalled
+
+    def stats(self):
+        return {
+            'captured': self.frames_captured,
+            'dropped': self.frames_dropped,
+            'duplicate': self.duplicate_reads,
+            'stalls': self.stalls,
+        }
+
+    def release(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+        self._cap.release()
@@ -0,0 +1,91 @@
+"""Dirty-rectangle display updates.
+
+In 'dirty' mode, draw code reports the screen areas it touched with add(),
+and present() sends only those areas to the display with
+pygame.display.update(rects). That covers what was drawn this frame and
+what was drawn last frame, which has now been painted over. When the
+background itself changed, or the dirty area covers more than
+max_fraction of the screen, present() does a full flip instead. In 'flip'
+mode every present() is a full flip, so the two can be compared with
+--display-update.
+"""
+import numpy as np
+import pygame
+
+DISPLAY_UPDATE_MODES = ('dirty', 'flip')
+MAX_DIRTY_FRACTION = 0.5  # above this share of the screen a full flip is cheaper
+
+
+def changed_rect(before, after):
+    """Bounding Rect of the pixels that differ between two same-format surfaces, or None."""
+    a = pygame.surfarray.pixels2d(before)
+    b = pygame.surfarray.pixels2d(after)
+    diff = a != b
+    cols = np.flatnonzero(diff.any(axis=1))
+    rows = np.flatnonzero(diff.any(axis=0))
+    del a, b  # unlock the surfaces
+    if not len(cols):
+        return None
+    return pygame.Rect(int(cols[0]), int(rows[0]), int(cols[-1] - cols[0] + 1), int(rows[-1] - rows[0] + 1))
+
+
+class DirtyRectTracker:
+    def __init__(self, screen_rect, mode='dirty', max_fraction=MAX_DIRTY_FRACTION):
+        if mode not in DISPLAY_UPDATE_MODES:
+            raise ValueError(f'Unknown display update mode: {mode!r}')
+        self.screen_rect = pygame.Rect(screen_rect)
+        self.mode = mode
+        self.max_area = max_fraction * self.screen_rect.width * self.screen_rect.height
+        self._rects = []
+        self._previous = []
+        self._full = True
+        self._source = None
+        self.flips = 0
+        self.updates = 0
+        self.updated_area = 0
+
+    @property
+    def enabled(self):
+        return self.mode == 'dirty'
+
+    def add(self, rect):
+        """Report an area drawn this frame (a Rect from blit/draw, or None)."""
+        if rect and self.enabled:
+            self._rects.append(rect)
+        return rect
+
+    def full(self):
+        """The whole screen changed this frame (background moved, state switched)."""
+        self._full = True
+
+    def present(self, source=None):
+        """Show this frame: an update of the dirty areas, or a full flip.
+        source names what drew the frame (a screen, or None for gameplay);
+        the first frame after a switch is always a full flip."""
+        if source != self._source:
+            self._source = source
+            self._full = True
+        if not self.enabled:
+            pygame.display.flip()
+            self.flips += 1
+            return
+        rects = self._rects + self._previous
+        area = sum(r.width * r.height for r in rects)
+        if self._full or area > self.max_area:
+            pygame.display.flip()
+            self.flips += 1
+        else:
+            if rects:
+                pygame.display.update(rects)
+            self.updates += 1
+            self.updated_area += area
+        self._previous = [r.clip(self.screen_rect) for r in self._rects]
+        self._rects = []
+        self._full = False
+
+    def stats(self):
+        stats = {'mode': self.mode, 'flips': self.flips, 'updates': self.updates}
+        if self.updates:
+            screen_area = self.screen_rect.width * self.screen_rect.height
+            stats['avg_update_fraction'] = round(self.updated_area / self.updates / screen_area, 3)
+        return stats
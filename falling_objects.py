@@ -0,0 +1,129 @@
+"""Falling objects as a struct of arrays.
+
+ObjectStore keeps every falling object's fields in NumPy arrays with the
+live objects packed in [:count]. The arrays are the pool: spawning writes
+into the next free slot and only grows the arrays (doubling) when they are
+full, so steady play allocates nothing per object. Removal fills the holes
+left by removed objects with survivors from the tail (swap-remove), and the
+per-frame fall, swing, rotation, wobble and bomb animation are integrated
+for all objects at once in step(). Each step keeps the previous position
+and rotation (prev_*) so the renderer can interpolate between steps.
+"""
+import numpy as np
+
+KINDS = ('banana', 'coconut', 'bomb')
+BANANA, COCONUT, BOMB = range(len(KINDS))
+
+OBJECT_CAPACITY = 64
+EDGE_MARGIN = 40         # px an object keeps from the side walls
+WOBBLE_RATE = 0.1        # radians per frame
+SWING_FACTOR = 0.5       # px per frame per unit of swing
+BOMB_FRAME_DELAY = 5     # frames per bomb animation frame
+
+FIELDS = {
+    'kind': np.uint8,
+    'x': np.float64,
+    'y': np.float64,
+    'radius': np.float64,
+    'caught': np.bool_,
+    'rotation': np.float64,
+    'rotation_speed': np.float64,
+    'scale': np.float64,
+    'wobble_phase': np.float64,
+    'fall_speed': np.float64,
+    'swing': np.float64,
+    'anim_index': np.int32,
+    'anim_counter': np.int32,
+    'prev_x': np.float64,
+    'prev_y': np.float64,
+    'prev_rotation': np.float64,
+}
+
+
+class ObjectStore:
+    def __init__(self, capacity=OBJECT_CAPACITY):
+        self.capacity = capacity
+        for name, dtype in FIELDS.items():
+            setattr(self, name, np.zeros(capacity, dtype=dtype))
+        self.count = 0
+        self.peak = 0
+        self.grows = 0
+
+    def __len__(self):
+        return self.count
+
+    def _grow(self):
+        self.capacity *= 2
+        for name in FIELDS:
+            old = getattr(self, name)
+            new = np.zeros(self.capacity, dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+        self.grows += 1
+
+    def spawn(self, kind, x, y, radius, rotation, rotation_speed, scale, wobble_phase, fall_speed, swing):
+        """Add an object (kind is one of KINDS) and return its slot."""
+        if self.count == self.capacity:
+            self._grow()
+        i = self.count
+        self.kind[i] = KINDS.index(kind)
+        self.x[i], self.y[i], self.radius[i] = x, y, radius
+        self.prev_x[i], self.prev_y[i], self.prev_rotation[i] = x, y, rotation
+        self.caught[i] = False
+        self.rotation[i], self.rotation_speed[i] = rotation, rotation_speed
+        self.scale[i], self.wobble_phase[i] = scale, wobble_phase
+        self.fall_speed[i], self.swing[i] = fall_speed, swing
+        self.anim_index[i] = self.anim_counter[i] = 0
+        self.count += 1
+        self.peak = max(self.peak, self.count)
+        return i
+
+    def remove(self, mask):
+        """Drop the live objects where the (count,) bool mask is set."""
+        n = self.count
+        keep = ~mask[:n]
+        k = int(np.count_nonzero(keep))
+        if k == n:
+            return
+        holes = np.flatnonzero(~keep[:k])       # removed slots among the first k
+        donors = k + np.flatnonzero(keep[k:])   # survivors beyond them, as many
+        if len(holes):
+            for name in FIELDS:
+                array = getattr(self, name)
+                array[holes] = array[donors]
+        self.count = k
+
+    def clear(self):
+        self.count = 0
+
+    def step(self, fall, width, animate=True, bomb_frames=0):
+        """Advance every object one frame: fall by fall * fall_speed px and,
+        with animate, spin, wobble and swing between the side walls and
+        cycle the bomb animation over bomb_frames frames."""
+        n = self.count
+        if not n:
+            return
+        self.prev_x[:n] = self.x[:n]
+        self.prev_y[:n] = self.y[:n]
+        self.prev_rotation[:n] = self.rotation[:n]
+        self.y[:n] += fall * self.fall_speed[:n]
+        if not animate:
+            return
+        self.rotation[:n] += self.rotation_speed[:n]
+        self.wobble_phase[:n] += WOBBLE_RATE
+        x, swing = self.x[:n], self.swing[:n]
+        x += swing * SWING_FACTOR
+        left, right = x < EDGE_MARGIN, x > width - EDGE_MARGIN
+        x[left] = EDGE_MARGIN
+        swing[left] = np.abs(swing[left])
+        x[right] = width - EDGE_MARGIN
+        swing[right] = -np.abs(swing[right])
+        if bomb_frames:
+            bombs = self.kind[:n] == BOMB
+            self.anim_counter[:n] += bombs
+            turn = self.anim_counter[:n] >= BOMB_FRAME_DELAY
+            self.anim_counter[:n][turn] = 0
+            self.anim_index[:n][turn] = (self.anim_index[:n][turn] + 1) % bomb_frames
+
+    def stats(self):
+        return {'live': self.count, 'peak': self.peak, 'capacity': self.capacity, 'grows': self.grows}
@@ -0,0 +1,147 @@
+"""Vectorized gesture classification over a short landmark history.
+
+Each inference result is copied once into a preallocated (T, H, 21, 3) ring
+buffer (T results, up to H hands). The gesture predicates and jump
+detection then run as NumPy operations over that history
+for all hands at once instead of reading landmark attributes one by one.
+
+Pointing and closed-hand states are debounced with hysteresis: a state only
+switches on after it has been seen in several consecutive results and only
+switches off after it has been missing for several, so a single misread
+frame no longer pauses or resumes the game.
+
+Jumps come from JumpDetector, which every input backend shares. It looks at
+how far a fingertip has risen within a short window instead of at a
+velocity estimate: a rise over a fixed time is an upward-speed threshold
+without differentiating noisy landmarks. No fingertip velocity is kept
+here, and PointerFilter's velocity only serves its own prediction.
+"""
+import numpy as np
+
+from hand_inference import NUM_LANDMARKS
+
+INDEX_TIP, INDEX_PIP = 8, 6
+FINGER_TIPS = np.array([8, 12, 16, 20])
+FINGER_PIPS = FINGER_TIPS - 2
+
+# Consecutive results needed to switch a state (on, off)
+POINTING_DEBOUNCE = (1, 2)
+CLOSED_DEBOUNCE = (3, 2)
+
+JUMP_TRIGGER_DELTA = 50  # px upward within recent frames triggers jump
+JUMP_TRIGGER_WINDOW = 8  # frames (at 60 FPS) window to consider rapid upward motion
+
+
+def index_finger_up(hands):
+    """(..., 21, 3) normalized landmarks -> (...) bool, index finger extended."""
+    return (hands[..., INDEX_TIP, 1] < hands[..., INDEX_PIP, 1]) & \
+        (np.abs(hands[..., INDEX_TIP, 0] - hands[..., INDEX_PIP, 0]) < 0.1)
+
+
+def hand_closed(hands):
+    """(..., 21, 3) normalized landmarks -> (...) bool, all four fingers folded."""
+    return np.all(hands[..., FINGER_TIPS, 1] > hands[..., FINGER_PIPS, 1], axis=-1)
+
+
+def _hysteresis(state, samples, debounce):
+    """Update (H,) bool state from (k, H) samples, newest last. Until there
+    are enough samples for a switch (right after start or a reset), it
+    doesn't happen."""
+    on_frames, off_frames = debounce
+    turn_on = samples[-on_frames:].all(axis=0) & (len(samples) >= on_frames)
+    turn_off = ~samples[-off_frames:].any(axis=0) & (len(samples) >= off_frames)
+    return np.where(turn_on, True, np.where(turn_off, False, state))
+
+
+class JumpDetector:
+    """Upward-flick detection for one or more pointers.
+
+    A jump fires when a pointer has risen JUMP_TRIGGER_DELTA px within the
+    last JUMP_TRIGGER_WINDOW frames, and re-arms once the rise drops below
+    half of that.
+    """
+
+    def __init__(self, pointers=1, capacity=16, delta=JUMP_TRIGGER_DELTA, window=JUMP_TRIGGER_WINDOW / 60.0):
+        self.delta = delta
+        self.window = window
+        self._times = np.full(capacity, -np.inf)
+        self._ys = np.zeros((capacity, pointers))
+        self._valid = np.zeros((capacity, pointers), dtype=bool)
+        self._head = 0
+        self._armed = np.ones(pointers, dtype=bool)
+
+    def update(self, t, ys, valid):
+        """Add one sample per pointer (screen y, valid flag); return (pointers,) bool jump events."""
+        i = self._head
+        self._times[i] = t
+        self._ys[i] = ys
+        self._valid[i] = valid
+        self._head = (i + 1) % len(self._times)
+
+        # How far each pointer has come up from its lowest point (largest
+        # screen y) within the window
+        recent = (self._times >= t - self.window)[:, None] & self._valid
+        lowest = np.where(recent, self._ys, -np.inf).max(axis=0)
+        rise = np.where(self._valid[i], lowest - self._ys[i], 0.0)
+
+        events = self._armed & (rise >= self.delta)
+        self._armed = np.where(events, False, self._armed | (rise < self.delta / 2))
+        return events
+
+
+class LandmarkHistory:
+    """Preallocated ring of the most recent landmark results."""
+
+    def __init__(self, capacity=16, max_num_hands=1):
+        self.capacity = capacity
+        self.points = np.zeros((capacity, max_num_hands, NUM_LANDMARKS, 3), dtype=np.float32)
+        self.valid = np.zeros((capacity, max_num_hands), dtype=bool)
+        self.times = np.full(capacity, -np.inf)
+        self.count = 0
+        self._head = 0
+
+    def push(self, hands, t):
+        """Store a (count, 21, 3) result in place."""
+        i = self._head
+        n = min(len(hands), self.points.shape[1])
+        self.points[i, :n] = hands[:n]
+        self.valid[i] = False
+        self.valid[i, :n] = True
+        self.times[i] = t
+        self._head = (i + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def recent(self, n):
+        """Ring indices of the last n results, oldest first."""
+        n = min(n, self.count)
+        return (self._head - n + np.arange(n)) % self.capacity
+
+
+class GestureTracker:
+    def __init__(self, width, height, max_num_hands=1, capacity=16):
+        self.scale = np.array([width, height], dtype=np.float64)
+        self.history = LandmarkHistory(capacity, max_num_hands)
+        self.jump_detector = JumpDetector(max_num_hands, capacity)
+        self._window = max(POINTING_DEBOUNCE + CLOSED_DEBOUNCE)
+
+        self.pointing = np.zeros(max_num_hands, dtype=bool)
+        self.closed = np.zeros(max_num_hands, dtype=bool)
+        self.tips = np.zeros((max_num_hands, 2))          # index fingertip, screen px
+        self.jump = np.zeros(max_num_hands, dtype=bool)   # jump gesture started this result
+
+    def update(self, hands, t):
+        """Add a (count, 21, 3) full-frame normalized result captured at time t."""
+        history = self.history
+        history.push(hands, t)
+        idx = history.recent(self._window)
+        points = history.points[idx]
+        valid = history.valid[idx]
+
+        self.pointing = _hysteresis(self.pointing, index_finger_up(points) & valid, POINTING_DEBOUNCE)
+        self.closed = _hysteresis(self.closed, hand_closed(points) & valid, CLOSED_DEBOUNCE)
+
+        now_valid = valid[-1]
+        tips = points[-1, :, INDEX_TIP, :2] * self.scale
+        self.tips = np.where(now_valid[:, None], tips, self.tips)
+
+        self.jump = self.jump_detector.update(t, tips[:, 1], now_valid)
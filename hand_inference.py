@@ -0,0 +1,287 @@
+"""MediaPipe hand inference in a separate worker process.
+
+hands.process() is the most expensive call per frame; running it on the
+render thread caps the game at the model's speed. HandInferenceWorker starts
+this file as its own Python process (so it gets its own core and its own
+GIL) and hands frames over through a shared-memory ring of frame slots, so
+image data is never pickled or copied through a pipe. Only slot numbers
+travel over the worker's stdin/stdout.
+
+Results come back in a second shared-memory block as one fixed-size float64
+row per slot:
+
+    [frame_id, capture_time, start_time, converted_time, done_time, hand_count,
+     hand 0: 21 x (x, y, z), hand 1: 21 x (x, y, z), ...]
+
+Landmark coordinates are normalized to the full frame, even when the worker
+only ran the model on a crop around the hand (see roi_tracker.py), with x
+mirrored like the old cv2.flip() of the image. Times are
+time.perf_counter() values, which share a clock across processes: capture
+(frame read from the camera), start (worker picked the slot up), converted
+(crop, resize and colour conversion done) and done (landmarks written), so
+the game can split each result's latency into stages (see profiler.py).
+
+The worker is a plain subprocess rather than a multiprocessing.Process:
+multiprocessing's spawn start method (the only one on Windows) re-runs the
+game script in the child, and the game has no __main__ guard.
+"""
+import os
+import queue
+import subprocess
+import sys
+import threading
+import time
+from multiprocessing import resource_tracker, shared_memory
+
+import cv2
+import numpy as np
+
+from roi_tracker import RoiTracker
+
+NUM_LANDMARKS = 21
+HAND_FLOATS = NUM_LANDMARKS * 3
+RESULT_FRAME_ID = 0
+RESULT_CAPTURE_TIME = 1
+RESULT_START_TIME = 2
+RESULT_CONVERTED_TIME = 3
+RESULT_DONE_TIME = 4
+RESULT_HAND_COUNT = 5
+RESULT_HEADER = 6
+
+
+def result_size(max_num_hands):
+    return RESULT_HEADER + max_num_hands * HAND_FLOATS
+
+
+def result_hands(result):
+    """View of the detected hands in a result row as a (count, 21, 3) array."""
+    count = int(result[RESULT_HAND_COUNT])
+    return result[RESULT_HEADER:RESULT_HEADER + count * HAND_FLOATS].reshape(count, NUM_LANDMARKS, 3)
+
+
+class HandInferenceWorker:
+    def __init__(self, frame_shape, slots=2, max_num_hands=1, min_detection_confidence=0.7, mirror=True,
+                 roi=True):
+        self.frame_shape = tuple(frame_shape)
+        self.slots = slots
+        self.max_num_hands = max_num_hands
+        self.min_detection_confidence = min_detection_confidence
+        self.mirror = mirror  # report x as seen in a mirror, like the player sees the screen
+        self.roi = roi  # search a tracked crop around the hand instead of the full frame
+
+        frame_bytes = int(np.prod(self.frame_shape))
+        row = result_size(max_num_hands)
+        self._frames_shm = shared_memory.SharedMemory(create=True, size=slots * frame_bytes)
+        self._results_shm = shared_memory.SharedMemory(create=True, size=slots * row * 8)
+        self._frames = np.ndarray((slots,) + self.frame_shape, dtype=np.uint8, buffer=self._frames_shm.buf)
+        self._results = np.ndarray((slots, row), dtype=np.float64, buffer=self._results_shm.buf)
+        self._results.fill(0)
+        self._latest = np.zeros(row, dtype=np.float64)
+
+        self._free = list(range(slots))
+        self._done = queue.Queue()
+        self._proc = None
+        self._reader = None
+
+        self.frames_submitted = 0
+        self.frames_skipped = 0   # worker busy (every slot in flight) or frame size changed
+        self.results_received = 0
+
+    def start(self):
+        args = [
+            sys.executable, os.path.abspath(__file__),
+            self._frames_shm.name, self._results_shm.name,
+            'x'.join(str(d) for d in self.frame_shape),
+            str(self.slots), str(self.max_num_hands), str(self.min_detection_confidence),
+            '1' if self.roi else '0', '1' if self.mirror else '0',
+        ]
+        self._proc = subprocess.Popen(args, stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+        self._reader = threading.Thread(target=self._read_done, name='hand-inference-results', daemon=True)
+        self._reader.start()
+        return self
+
+    def _read_done(self):
+        for line in self._proc.stdout:
+            try:
+                self._done.put(int(line))
+            except ValueError:
+                continue
+
+    @property
+    def failed(self):
+        return self._proc is not None and self._proc.poll() is not None
+
+    def submit(self, frame, frame_id, capture_time):
+        """Copy a BGR frame into a free slot and queue it. Never blocks.
+
+        Returns False (and drops the frame) when every slot is still being
+        processed; the caller simply submits a newer frame next time.
+        """
+        if not self._free or frame.shape != self.frame_shape or self.failed:
+            self.frames_skipped += 1
+            return False
+        slot = self._free.pop()
+        # The only copy of the frame on this side; mirroring is applied to
+        # the landmarks in the worker instead of flipping the image
+        np.copyto(self._frames[slot], frame)
+        self._results[slot, RESULT_FRAME_ID] = frame_id
+        self._results[slot, RESULT_CAPTURE_TIME] = capture_time
+        try:
+            self._proc.stdin.write(b'%d\n' % slot)
+            self._proc.stdin.flush()
+        except (BrokenPipeError, OSError):
+            self._free.append(slot)
+            return False
+        self.frames_submitted += 1
+        return True
+
+    def poll(self):
+        """Return the newest finished result row, or None if nothing new.
+
+        The returned array is reused by the next poll(); copy it to keep it.
+        """
+        updated = False
+        while True:
+            try:
+                slot = self._done.get_nowait()
+            except queue.Empty:
+                break
+            row = self._results[slot]
+            if row[RESULT_FRAME_ID] > self._latest[RESULT_FRAME_ID]:
+                np.copyto(self._latest, row)
+                updated = True
+            self._free.append(slot)
+            self.results_received += 1
+        return self._latest if updated else None
+
+    def stats(self):
+        return {
+            'submitted': self.frames_submitted,
+            'skipped': self.frames_skipped,
+            'received': self.results_received,
+        }
+
+    def close(self):
+        if self._proc is not None:
+            try:
+                self._proc.stdin.close()
+            except OSError:
+                pass
+            try:
+                self._proc.wait(timeout=2.0)
+            except subprocess.TimeoutExpired:
+                self._proc.kill()
+                self._proc.wait()
+        del self._frames, self._results
+        for shm in (self._frames_shm, self._results_shm):
+            shm.close()
+            shm.unlink()
+
+
+# -------------------- Worker process side --------------------
+
+def _attach(name):
+    shm = shared_memory.SharedMemory(name=name)
+    if os.name == 'posix':
+        # Attaching registers the block with this process's resource tracker,
+        # which would unlink it on exit; the game process owns it.
+        resource_tracker.unregister(shm._name, 'shared_memory')
+    return shm
+
+
+class RgbConverter:
+    """BGR -> RGB conversion into buffers reused across frames.
+
+    One buffer is kept per image shape (the ROI crop and the full frame), and
+    a read-only view of it is returned so MediaPipe can use the pixels in
+    place rather than copying them.
+    """
+
+    def __init__(self):
+        self._buffers = {}
+
+    def __call__(self, bgr):
+        entry = self._buffers.get(bgr.shape)
+        if entry is None:
+            buf = np.empty(bgr.shape, dtype=np.uint8)
+            view = buf.view()
+            view.flags.writeable = False
+            entry = self._buffers[bgr.shape] = (buf, view)
+        cv2.cvtColor(bgr, cv2.COLOR_BGR2RGB, dst=entry[0])
+        return entry[1]
+
+
+def _detect(hands, frame, row, max_num_hands, roi, to_rgb):
+    """Run the model on one BGR frame and write full-frame landmarks into row."""
+    if roi is not None:
+        image, region = roi.prepare(frame)
+    else:
+        image, region = frame, None
+    image = to_rgb(image)
+    row[RESULT_CONVERTED_TIME] = time.perf_counter()
+    detection = hands.process(image)
+    count = 0
+    if detection.multi_hand_landmarks:
+        for hand_landmarks in detection.multi_hand_landmarks[:max_num_hands]:
+            start = RESULT_HEADER + count * HAND_FLOATS
+            points = row[start:start + HAND_FLOATS].reshape(NUM_LANDMARKS, 3)
+            for i, lm in enumerate(hand_landmarks.landmark):
+                points[i] = (lm.x, lm.y, lm.z)
+            if region is not None:
+                roi.map_to_frame(points, region)
+            count += 1
+    row[RESULT_HAND_COUNT] = count
+    return count
+
+
+def _worker_main(argv):
+    frames_name, results_name, shape_arg, slots_arg, hands_arg, conf_arg, roi_arg, mirror_arg = argv
+    use_roi, mirror = roi_arg == '1', mirror_arg == '1'
+    frame_shape = tuple(int(d) for d in shape_arg.split('x'))
+    slots, max_num_hands = int(slots_arg), int(hands_arg)
+
+    # Slot numbers go back on the real stdout; anything else printed in this
+    # process (library logging) is sent to stderr so it can't corrupt them.
+    results_out = os.fdopen(os.dup(sys.stdout.fileno()), 'wb', buffering=0)
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+
+    import mediapipe as mp
+    hands = mp.solutions.hands.Hands(max_num_hands=max_num_hands, min_detection_confidence=float(conf_arg))
+
+    frames_shm = _attach(frames_name)
+    results_shm = _attach(results_name)
+    frames = np.ndarray((slots,) + frame_shape, dtype=np.uint8, buffer=frames_shm.buf)
+    results = np.ndarray((slots, result_size(max_num_hands)), dtype=np.float64, buffer=results_shm.buf)
+    roi = RoiTracker(frame_shape) if use_roi else None
+    to_rgb = RgbConverter()
+    try:
+        for line in sys.stdin.buffer:
+            slot = int(line)
+            row = results[slot]
+            row[RESULT_START_TIME] = time.perf_counter()
+            count = _detect(hands, frames[slot], row, max_num_hands, roi, to_rgb)
+            if count == 0 and roi is not None and roi.tracking:
+                # Lost the hand inside the crop: search the whole frame right away
+                # (the retry counts as inference time, not conversion)
+                converted_time = row[RESULT_CONVERTED_TIME]
+                roi.update(result_hands(row))
+                count = _detect(hands, frames[slot], row, max_num_hands, roi, to_rgb)
+                row[RESULT_CONVERTED_TIME] = converted_time
+            if roi is not None:
+                roi.update(result_hands(row))
+            if mirror:
+                landmarks = result_hands(row)
+                landmarks[..., 0] = 1.0 - landmarks[..., 0]
+            row[RESULT_DONE_TIME] = time.perf_counter()
+            results_out.write(b'%d\n' % slot)
+    except (BrokenPipeError, KeyboardInterrupt):
+        pass
+    finally:
+        hands.close()
+        del frames, results
+        frames_shm.close()
+        results_shm.close()
+
+
+if __name__ == '__main__':
+    _worker_main(sys.argv[1:])
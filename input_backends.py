@@ -0,0 +1,252 @@
+"""Input backends: where the pointer and hand gestures come from.
+
+Every backend turns its source into one reading per game tick,
+(pointer, pointing, closed): pointer is the fingertip in screen coordinates
+while pointing (None otherwise) and closed is the pause gesture. poll() also
+sets tick_time (the time this tick stands for), sample_time (when the
+pointer was actually measured, for pointer_filter) and jump (an upward flick
+started on this tick).
+
+Pick one with --input NAME[:ARG] or the BANANA_RUSH_INPUT environment variable:
+
+    mediapipe[:CAMERA]  webcam + MediaPipe worker process (default, camera 0)
+    video:PATH          MediaPipe on a video file, paced to its frame rate and looped
+    mouse               mouse or touchscreen; no camera, no inference
+    synthetic           scripted pointer that also drives the menus, for load tests
+    replay:PATH         a file written with --record
+"""
+import math
+import time
+from abc import ABC, abstractmethod
+
+import pygame
+
+from capture import LatestFrameCapture
+from gestures import GestureTracker, JumpDetector
+from hand_inference import HandInferenceWorker, result_hands, RESULT_CAPTURE_TIME
+from landmark_log import LandmarkReplay
+from vision_scheduler import VisionScheduler
+
+DEFAULT_INPUT = 'mediapipe'
+INPUT_ENV_VAR = 'BANANA_RUSH_INPUT'
+
+
+class InputBackend(ABC):
+    records_landmarks = False  # True if last_result holds landmark rows for --record
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.tick_time = 0.0
+        self.sample_time = 0.0
+        self.jump = False
+        self.finished = False  # the source ran out (camera failed, recording ended)
+
+    @abstractmethod
+    def poll(self, game_state):
+        """Return (pointer, pointing, closed) for this tick."""
+
+    def stats(self):
+        return {}
+
+    def close(self):
+        pass
+
+
+class LandmarkBackend(InputBackend):
+    """Base for backends that produce hand landmark result rows.
+
+    Subclasses implement _next_result(); the landmark -> gesture step (see
+    gestures.py) and the rule that readings are dropped while the camera is
+    stalled or the current screen doesn't track the hand live here, so live
+    and replayed input go through exactly the same code.
+    """
+    records_landmarks = True
+
+    def __init__(self, width, height, scheduler=None, max_num_hands=1):
+        super().__init__(width, height)
+        self.scheduler = scheduler or VisionScheduler()
+        self.gestures = GestureTracker(width, height, max_num_hands)
+        self.last_result = None
+        self.stalled = False
+        self._reading = (None, False, False)
+
+    @abstractmethod
+    def _next_result(self, game_state):
+        """Set tick_time and stalled; return a new result row or None."""
+
+    def poll(self, game_state):
+        result = self._next_result(game_state)
+        self.last_result = result
+        pointer, pointing, closed = self._reading
+        self.jump = False
+        if result is not None:
+            gestures = self.gestures
+            gestures.update(result_hands(result), result[RESULT_CAPTURE_TIME])
+            pointing_hands = gestures.pointing.nonzero()[0]
+            pointing = len(pointing_hands) > 0
+            closed = bool(gestures.closed.any())
+            pointer = None
+            if pointing:
+                # Like before, the last pointing hand drives the pointer
+                hand = pointing_hands[-1]
+                pointer = (int(gestures.tips[hand, 0]), int(gestures.tips[hand, 1]))
+                self.jump = bool(gestures.jump[hand])
+            self.sample_time = result[RESULT_CAPTURE_TIME]
+        if self.stalled or not self.scheduler.active(game_state):
+            # Camera stopped delivering or the hand isn't tracked on this screen:
+            # don't keep acting on a stale hand reading
+            pointer, pointing, closed = None, False, False
+            self.jump = False
+        self._reading = (pointer, pointing, closed)
+        return self._reading
+
+
+class MediaPipeBackend(LandmarkBackend):
+    def __init__(self, width, height, source=0, max_num_hands=1, min_detection_confidence=0.7,
+                 realtime=False, loop=False):
+        super().__init__(width, height, max_num_hands=max_num_hands)
+        self.max_num_hands = max_num_hands
+        self.min_detection_confidence = min_detection_confidence
+        # Frames are read on their own thread, the game takes the newest
+        self.capture = LatestFrameCapture(source, realtime=realtime, loop=loop).start()
+        # MediaPipe runs in a worker process; started once the frame size is known
+        self.worker = None
+        self._last_frame_id = 0
+
+    def _next_result(self, game_state):
+        self.tick_time = time.perf_counter()
+        if self.capture.failed:
+            self.finished = True
+            return None
+        frame_id, frame, frame_time = self.capture.read()
+        if frame_id != self._last_frame_id:
+            self._last_frame_id = frame_id
+            if self.scheduler.should_infer(game_state, frame_time):
+                if self.worker is None:
+                    self.worker = HandInferenceWorker(frame.shape, max_num_hands=self.max_num_hands,
+                                                      min_detection_confidence=self.min_detection_confidence).start()
+                # Mirrored into shared memory; inference itself happens off this thread
+                self.worker.submit(frame, frame_id, frame_time)
+        self.stalled = self.capture.stalled
+        return self.worker.poll() if self.worker else None
+
+    def stats(self):
+        stats = {'camera': self.capture.stats(), 'schedule': self.scheduler.stats()}
+        if self.worker:
+            stats['inference'] = self.worker.stats()
+        return stats
+
+    def close(self):
+        self.capture.release()
+        if self.worker:
+            self.worker.close()
+
+
+class VideoFileBackend(MediaPipeBackend):
+    def __init__(self, width, height, path, loop=True):
+        super().__init__(width, height, source=path, realtime=True, loop=loop)
+
+
+class ReplayBackend(LandmarkBackend):
+    def __init__(self, width, height, path):
+        super().__init__(width, height)
+        self.replay = LandmarkReplay(path)
+        self.seed = self.replay.seed
+
+    def _next_result(self, game_state):
+        tick = self.replay.next_tick()
+        if tick is None:
+            self.finished = True
+            return None
+        self.tick_time, result, _, _, self.stalled, keys = tick
+        # Live key presses are ignored; the recorded ones drive the menus
+        pygame.event.get(pygame.KEYDOWN)
+        for key, ch in keys:
+            pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=key, unicode=ch))
+        return result
+
+    def stats(self):
+        return {'ticks': self.replay.ticks}
+
+
+class MouseBackend(InputBackend):
+    """Mouse or touchscreen. Holding the left button (a finger on a touch
+    screen) points; holding the right button is the closed hand (pause)."""
+
+    def __init__(self, width, height):
+        super().__init__(width, height)
+        self.jump_detector = JumpDetector()
+
+    def poll(self, game_state):
+        self.tick_time = self.sample_time = time.perf_counter()
+        left, _, right = pygame.mouse.get_pressed()
+        pointer = pygame.mouse.get_pos() if left and not right and pygame.mouse.get_focused() else None
+        self.jump = bool(self.jump_detector.update(self.tick_time, pointer[1] if pointer else 0, pointer is not None)[0])
+        return pointer, pointer is not None, bool(right)
+
+
+# Keys the synthetic backend presses to get through each screen
+AUTOPLAY_KEYS = {
+    'main_menu': [(pygame.K_RETURN, '\r')],
+    'name_entry': [(pygame.K_b, 'b'), (pygame.K_o, 'o'), (pygame.K_t, 't'), (pygame.K_RETURN, '\r')],
+    'menu': [(pygame.K_2, '2'), (pygame.K_s, 's')],
+    'game_over': [(pygame.K_r, 'r')],
+}
+
+
+class SyntheticBackend(InputBackend):
+    """Scripted input for load tests. The pointer sweeps back and forth across
+    the screen and flicks up to jump every few seconds; menus are passed by
+    pressing AUTOPLAY_KEYS after a short delay. Time advances one 60 Hz frame
+    per tick, so runs are repeatable with a fixed --seed."""
+
+    def __init__(self, width, height, sweep_hz=0.25, jump_every=3.0, menu_delay=30):
+        super().__init__(width, height)
+        self.sweep_hz = sweep_hz
+        self.jump_every = jump_every
+        self.menu_delay = menu_delay  # ticks spent on a screen before pressing its keys
+        self.ticks = 0
+        self._state = None
+        self._state_ticks = 0
+        self.jump_detector = JumpDetector()
+
+    def poll(self, game_state):
+        self.ticks += 1
+        self.tick_time = self.sample_time = self.ticks / 60.0
+        if game_state != self._state:
+            self._state = game_state
+            self._state_ticks = 0
+        self._state_ticks += 1
+        if self._state_ticks == self.menu_delay:
+            for key, ch in AUTOPLAY_KEYS.get(game_state, []):
+                pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=key, unicode=ch))
+        if game_state not in ('running', 'paused'):
+            self.jump = False
+            return None, False, False
+        t = self.tick_time
+        x = self.width / 2 + (self.width / 2 - 80) * math.sin(2 * math.pi * self.sweep_hz * t)
+        y = self.height * 0.6
+        if t % self.jump_every < 0.1:
+            y -= self.height * 0.4
+        self.jump = bool(self.jump_detector.update(t, y, True)[0])
+        return (int(x), int(y)), True, False
+
+    def stats(self):
+        return {'ticks': self.ticks}
+
+
+def create_backend(spec, width, height):
+    """Build a backend from a NAME[:ARG] spec (see module docstring)."""
+    name, _, arg = spec.partition(':')
+    if name == 'mediapipe':
+        return MediaPipeBackend(width, height, source=int(arg) if arg else 0)
+    if name == 'video' and arg:
+        return VideoFileBackend(width, height, arg)
+    if name == 'replay' and arg:
+        return ReplayBackend(width, height, arg)
+    if name == 'mouse':
+        return MouseBackend(width, height)
+    if name == 'synthetic':
+        return SyntheticBackend(width, height)
+    raise ValueError(f'Unknown input backend: {spec!r}')
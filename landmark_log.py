@@ -0,0 +1,96 @@
+"""Record and replay the per-tick hand input stream.
+
+A recording lets the game run without a webcam or MediaPipe: every main-loop
+tick stores its timestamp, the inference result that arrived on that tick
+(frame id, worker stage times, 21 landmarks per hand) plus the pointing and
+closed flags, and the key presses handled that tick. Replaying the file with
+the recorded random seed reproduces the same game, so runs can be compared
+frame for frame.
+
+File layout (little endian):
+
+    header: b'BRLM', version u16, max_num_hands u16, seed i64
+    tick:   tick_time f64, flags u8 (result/pointing/closed/stalled), key_count u8
+            [result row: result_size(max_num_hands) x f64]  if flags & HAS_RESULT
+            key_count x (key i32, unicode u32)
+"""
+import struct
+
+import numpy as np
+
+from hand_inference import result_size
+
+MAGIC = b'BRLM'
+VERSION = 2
+HEADER = struct.Struct('<4sHHq')
+TICK = struct.Struct('<dBB')
+KEY = struct.Struct('<iI')
+
+HAS_RESULT = 1
+HAND_POINTING = 2
+HAND_CLOSED = 4
+CAMERA_STALLED = 8
+
+
+class LandmarkRecorder:
+    def __init__(self, path, seed, max_num_hands=1):
+        self.path = path
+        self.max_num_hands = max_num_hands
+        self._file = open(path, 'wb')
+        self._file.write(HEADER.pack(MAGIC, VERSION, max_num_hands, seed))
+        self.ticks = 0
+
+    def write_tick(self, tick_time, result, pointing, closed, stalled, keys=()):
+        """Append one tick. result is a worker result row or None; keys is a
+        sequence of (key, unicode) pairs."""
+        flags = (HAS_RESULT if result is not None else 0) | (HAND_POINTING if pointing else 0) \
+            | (HAND_CLOSED if closed else 0) | (CAMERA_STALLED if stalled else 0)
+        keys = keys[:255]
+        self._file.write(TICK.pack(tick_time, flags, len(keys)))
+        if result is not None:
+            self._file.write(np.asarray(result, dtype='<f8').tobytes())
+        for key, ch in keys:
+            self._file.write(KEY.pack(key, ord(ch) if ch else 0))
+        self.ticks += 1
+
+    def close(self):
+        self._file.close()
+
+
+class LandmarkReplay:
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._data = f.read()
+        magic, version, self.max_num_hands, self.seed = HEADER.unpack_from(self._data, 0)
+        if magic != MAGIC:
+            raise ValueError(f'{path} is not a Banana Rush landmark recording')
+        if version != VERSION:
+            raise ValueError(f'{path} is a version {version} landmark recording; '
+                             f'this build only replays version {VERSION}')
+        self._row_bytes = result_size(self.max_num_hands) * 8
+        self._offset = HEADER.size
+        self._result = np.zeros(result_size(self.max_num_hands), dtype=np.float64)
+        self.ticks = 0
+
+    def next_tick(self):
+        """Return (tick_time, result, pointing, closed, stalled, keys) for the next tick,
+        or None at the end of the recording. result is None on ticks without
+        a new inference result and is reused by the next call otherwise."""
+        if self._offset + TICK.size > len(self._data):
+            return None
+        tick_time, flags, key_count = TICK.unpack_from(self._data, self._offset)
+        self._offset += TICK.size
+        result = None
+        if flags & HAS_RESULT:
+            self._result[:] = np.frombuffer(self._data, dtype='<f8', count=len(self._result), offset=self._offset)
+            self._offset += self._row_bytes
+            result = self._result
+        keys = []
+        for _ in range(key_count):
+            key, ch = KEY.unpack_from(self._data, self._offset)
+            self._offset += KEY.size
+            keys.append((key, chr(ch) if ch else ''))
+        self.ticks += 1
+        return (tick_time, result, bool(flags & HAND_POINTING), bool(flags & HAND_CLOSED),
+                bool(flags & CAMERA_STALLED), keys)
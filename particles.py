@@ -0,0 +1,116 @@
+"""Fixed-capacity particle engine.
+
+Particles live in preallocated NumPy arrays (struct of arrays): position,
+velocity, remaining life and an index into a colour table. The live
+particles are always packed at the front, so one frame is a handful of
+vectorized operations over [:count]: integrate, age, then compact the
+survivors forward, which reuses the slots of the dead ones. Emission is
+capped by the free capacity, so a large burst can never grow the arrays;
+limit lowers that cap further (quality scaling) without reallocating.
+
+Drawing uses one pre-rendered dot per (colour, radius), sent to the screen
+in a single Surface.blits() call instead of one pygame.draw.circle each.
+"""
+import numpy as np
+import pygame
+
+PARTICLE_CAPACITY = 2048
+PARTICLE_LIFE = 30           # frames
+PARTICLE_GRAVITY = 0.3       # px per frame^2
+LIFE_PER_RADIUS = 6          # radius = life // 6, at least 1
+BURST_SPREAD = 20            # px around the emission point
+BURST_VX = (-5, 5)
+BURST_VY = (-8, -2)
+
+
+class ParticleEngine:
+    def __init__(self, palettes, capacity=PARTICLE_CAPACITY, life=PARTICLE_LIFE, seed=None):
+        """palettes maps a name (e.g. 'banana') to the colours its bursts pick from."""
+        self.capacity = capacity
+        self.limit = capacity  # live particles allowed, at most capacity
+        self.life = life
+        self.pos = np.zeros((capacity, 2), dtype=np.float32)
+        self.vel = np.zeros((capacity, 2), dtype=np.float32)
+        self.ttl = np.zeros(capacity, dtype=np.int16)
+        self.color = np.zeros(capacity, dtype=np.uint8)
+        self.count = 0
+        self.dropped = 0
+        self.peak = 0
+        self._rng = np.random.default_rng(seed)
+
+        colors = []
+        self._palettes = {}  # name -> indices into the colour table
+        for name, palette in palettes.items():
+            self._palettes[name] = np.arange(len(colors), len(colors) + len(palette), dtype=np.uint8)
+            colors.extend(palette)
+        self.max_radius = max(1, life // LIFE_PER_RADIUS)
+        # _dots[colour, radius] -> pre-rendered disc (radius 0 unused)
+        self._dots = np.empty((len(colors), self.max_radius + 1), dtype=object)
+        for c, rgb in enumerate(colors):
+            for radius in range(1, self.max_radius + 1):
+                dot = pygame.Surface((2 * radius, 2 * radius)).convert()
+                dot.set_colorkey((0, 0, 0))
+                pygame.draw.circle(dot, rgb, (radius, radius), radius)
+                self._dots[c, radius] = dot
+
+    def emit(self, x, y, palette, n=10):
+        """Burst of up to n particles around (x, y); returns how many fit."""
+        n_fit = min(n, min(self.limit, self.capacity) - self.count)
+        if n_fit <= 0:
+            self.dropped += n
+            return 0
+        self.dropped += n - n_fit
+        s = slice(self.count, self.count + n_fit)
+        rng = self._rng
+        self.pos[s, 0] = x + rng.integers(-BURST_SPREAD, BURST_SPREAD + 1, n_fit)
+        self.pos[s, 1] = y + rng.integers(-BURST_SPREAD, BURST_SPREAD + 1, n_fit)
+        self.vel[s, 0] = rng.uniform(*BURST_VX, n_fit)
+        self.vel[s, 1] = rng.uniform(*BURST_VY, n_fit)
+        self.ttl[s] = self.life
+        self.color[s] = rng.choice(self._palettes[palette], n_fit)
+        self.count += n_fit
+        self.peak = max(self.peak, self.count)
+        return n_fit
+
+    def update(self):
+        """Advance one frame and drop the particles whose life ran out."""
+        n = self.count
+        if not n:
+            return
+        self.pos[:n] += self.vel[:n]
+        self.vel[:n, 1] += PARTICLE_GRAVITY
+        self.ttl[:n] -= 1
+        alive = self.ttl[:n] > 0
+        k = int(np.count_nonzero(alive))
+        if k < n:
+            # Pack the survivors to the front; the tail becomes free slots
+            for array in (self.pos, self.vel, self.ttl, self.color):
+                array[:k] = array[:n][alive]
+            self.count = k
+
+    def draw(self, surface, alpha=1.0):
+        """Blit every live particle, alpha of the way from the previous update
+        to the last one; returns the bounding Rect drawn, or None."""
+        n = self.count
+        if not n:
+            return None
+        radius = np.maximum(1, self.ttl[:n] // LIFE_PER_RADIUS)
+        pos = self.pos[:n]
+        if alpha < 1.0:
+            # The last update moved each particle by its velocity before gravity;
+            # particles emitted since then have not moved yet
+            moved = self.ttl[:n] < self.life
+            last_move = self.vel[:n] - (0.0, PARTICLE_GRAVITY)
+            pos = pos - (1.0 - alpha) * moved[:, None] * last_move
+        corners = pos.astype(np.int32) - radius[:, None]
+        dots = self._dots[self.color[:n], radius]
+        surface.blits(list(zip(dots, corners.tolist())), doreturn=False)
+        left, top = corners.min(axis=0)
+        right, bottom = (corners + 2 * radius[:, None]).max(axis=0)
+        return pygame.Rect(int(left), int(top), int(right - left), int(bottom - top))
+
+    def clear(self):
+        self.count = 0
+
+    def stats(self):
+        return {'live': self.count, 'peak': self.peak, 'dropped': self.dropped}
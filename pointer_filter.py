@@ -0,0 +1,70 @@
+"""Fingertip filtering and prediction between hand inference results.
+
+Hand landmarks arrive at whatever rate the inference worker manages (15-30 Hz
+and with some latency), while the pointer is drawn at 60 Hz. PointerFilter is
+a two-axis One-Euro filter: it smooths the noisy fingertip heavily when the
+hand is still and lightly when it moves fast, and keeps a filtered velocity
+estimate. predict() extrapolates along that velocity to any render time, so
+the pointer keeps moving smoothly between results and the capture-to-result
+latency is partly hidden. The velocity is internal to the filter; jumps
+are detected by gestures.JumpDetector.
+
+Reference: Casiez, Roussel & Vogel, "1 Euro Filter", CHI 2012.
+"""
+import math
+
+
+def _alpha(cutoff, dt):
+    tau = 1.0 / (2 * math.pi * cutoff)
+    return 1.0 / (1.0 + tau / dt)
+
+
+class PointerFilter:
+    def __init__(self, min_cutoff=1.5, beta=0.01, d_cutoff=2.0, max_extrapolation=0.12):
+        self.min_cutoff = min_cutoff  # Hz; lower = smoother when the hand is still
+        self.beta = beta              # cutoff increase per px/s of speed; higher = less lag
+        self.d_cutoff = d_cutoff      # Hz; smoothing of the velocity estimate
+        self.max_extrapolation = max_extrapolation  # seconds predict() may look ahead
+        self.reset()
+
+    def reset(self):
+        self._x = None
+        self._y = None
+        self._vx = 0.0
+        self._vy = 0.0
+        self._raw = None
+        self._t = None
+
+    @property
+    def active(self):
+        return self._t is not None
+
+    def update(self, point, t):
+        """Add a fingertip measurement (x, y) taken at time t (seconds)."""
+        x, y = point
+        if self._t is None:
+            self._x, self._y = float(x), float(y)
+            self._raw = (x, y)
+            self._t = t
+            return
+        if t <= self._t:
+            return
+        dt = t - self._t
+        # Velocity from consecutive raw samples (the filtered position lags
+        # behind and would overstate the speed)
+        a_d = _alpha(self.d_cutoff, dt)
+        self._vx += a_d * ((x - self._raw[0]) / dt - self._vx)
+        self._vy += a_d * ((y - self._raw[1]) / dt - self._vy)
+        self._raw = (x, y)
+        speed = math.hypot(self._vx, self._vy)
+        a = _alpha(self.min_cutoff + self.beta * speed, dt)
+        self._x += a * (x - self._x)
+        self._y += a * (y - self._y)
+        self._t = t
+
+    def predict(self, t):
+        """Filtered position extrapolated to time t, or None before any measurement."""
+        if self._t is None:
+            return None
+        ahead = min(max(t - self._t, 0.0), self.max_extrapolation)
+        return self._x + self._vx * ahead, self._y + self._vy * ahead
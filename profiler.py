@@ -0,0 +1,87 @@
+"""Low-overhead per-stage frame timing.
+
+FrameProfiler keeps one fixed-size ring buffer of durations per stage. The
+main loop calls begin_frame() and then mark(stage) after each stage, which
+stores the time since the previous mark; durations measured elsewhere (the
+inference worker's timestamps, camera-to-flip latency) go in with record().
+Nothing is allocated per frame, and percentiles are only computed when the
+overlay or a dump asks for them.
+"""
+import json
+import time
+
+import numpy as np
+
+
+class FrameProfiler:
+    def __init__(self, stages, capacity=600, dump_path=None, dump_interval=10.0):
+        self.stages = list(stages)
+        self.capacity = capacity
+        self.dump_path = dump_path
+        self.dump_interval = dump_interval
+        self._index = {name: i for i, name in enumerate(self.stages)}
+        self._samples = np.zeros((len(self.stages), capacity))
+        self._heads = [0] * len(self.stages)
+        self._counts = [0] * len(self.stages)
+        self._last = 0.0
+        self.frame_start = 0.0
+        self._next_dump = time.perf_counter() + dump_interval
+        self.frames = 0
+
+    def record(self, stage, seconds):
+        i = self._index[stage]
+        head = self._heads[i]
+        self._samples[i, head] = seconds
+        self._heads[i] = (head + 1) % self.capacity
+        if self._counts[i] < self.capacity:
+            self._counts[i] += 1
+
+    def begin_frame(self):
+        self.frame_start = self._last = time.perf_counter()
+
+    def mark(self, stage):
+        """Record the time since begin_frame() or the previous mark() as stage."""
+        now = time.perf_counter()
+        self.record(stage, now - self._last)
+        self._last = now
+        return now
+
+    def end_frame(self):
+        """Record the whole frame and dump to file when the interval has passed."""
+        now = time.perf_counter()
+        self.record('frame', now - self.frame_start)
+        self.frames += 1
+        if self.dump_path and now >= self._next_dump:
+            self._next_dump = now + self.dump_interval
+            self.dump()
+        return now
+
+    def percentiles(self, stage, q=(50, 95, 99)):
+        """Percentiles of a stage in milliseconds, or None before any sample."""
+        i = self._index[stage]
+        count = self._counts[i]
+        if not count:
+            return None
+        return np.percentile(self._samples[i, :count], q) * 1000.0
+
+    def report(self):
+        """[(stage, p50_ms, p95_ms, p99_ms)] for every stage with samples."""
+        rows = []
+        for stage in self.stages:
+            p = self.percentiles(stage)
+            if p is not None:
+                rows.append((stage, *p))
+        return rows
+
+    def dump(self):
+        entry = {
+            'time': time.time(),
+            'frames': self.frames,
+            'stages_ms': {stage: {'p50': round(p50, 3), 'p95': round(p95, 3), 'p99': round(p99, 3)}
+                          for stage, p50, p95, p99 in self.report()},
+        }
+        try:
+            with open(self.dump_path, 'a') as f:
+                f.write(json.dumps(entry) + '\n')
+        except OSError as e:
+            print('Profile dump failed:', e)
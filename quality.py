@@ -0,0 +1,88 @@
+"""Frame-time driven quality scaling.
+
+QUALITY_LEVELS go from full detail down, each level dropping one more
+expensive effect on top of the previous ones. In auto mode,
+QualityController watches the work time of the last WINDOW frames and
+steps down a level when their p90 is over the frame budget, and back up
+only once it has been well under budget (UP_FRACTION) for UP_WINDOWS
+windows in a row. The gap between the two thresholds, the longer wait to
+step up and the history being cleared after every change keep it from
+flapping between two levels. A level can also be fixed from the options
+screen, which turns auto off.
+"""
+import numpy as np
+
+FRAME_BUDGET = 1 / 60    # seconds
+WINDOW = 60              # frames per decision
+UP_FRACTION = 0.6        # step back up below this share of the budget
+UP_WINDOWS = 3
+
+# name, sprite shadows, sprite rotation step (deg), wobble scaling, particle cap, background motion
+QUALITY_LEVELS = [
+    {'name': 'high', 'shadows': True, 'angle_step': 5, 'wobble': True, 'particles': None, 'parallax': True},
+    {'name': 'no shadows', 'shadows': False, 'angle_step': 5, 'wobble': True, 'particles': None, 'parallax': True},
+    {'name': 'coarse sprites', 'shadows': False, 'angle_step': 15, 'wobble': False, 'particles': None,
+     'parallax': True},
+    {'name': 'few particles', 'shadows': False, 'angle_step': 15, 'wobble': False, 'particles': 200,
+     'parallax': True},
+    {'name': 'static background', 'shadows': False, 'angle_step': 15, 'wobble': False, 'particles': 200,
+     'parallax': False},
+]
+
+
+class QualityController:
+    def __init__(self, budget=FRAME_BUDGET, window=WINDOW, level=0, auto=True):
+        self.budget = budget
+        self.window = window
+        self.level = level
+        self.auto = auto
+        self._times = np.zeros(window)
+        self._count = 0
+        self._good_windows = 0
+        self.changes = 0
+
+    @property
+    def settings(self):
+        return QUALITY_LEVELS[self.level]
+
+    @property
+    def label(self):
+        return f"{self.settings['name']}{' (auto)' if self.auto else ''}"
+
+    def set(self, level=None):
+        """Fix the level, or go back to auto with level=None."""
+        self.auto = level is None
+        if level is not None and level != self.level:
+            self.level = level
+            self.changes += 1
+        self._count = self._good_windows = 0
+
+    def update(self, frame_seconds):
+        """Add one frame's work time; True if the level changed."""
+        if not self.auto:
+            return False
+        self._times[self._count] = frame_seconds
+        self._count += 1
+        if self._count < self.window:
+            return False
+        self._count = 0
+        p90 = np.percentile(self._times, 90)
+        if p90 > self.budget:
+            self._good_windows = 0
+            if self.level < len(QUALITY_LEVELS) - 1:
+                self.level += 1
+                self.changes += 1
+                return True
+        elif p90 < self.budget * UP_FRACTION:
+            self._good_windows += 1
+            if self._good_windows >= UP_WINDOWS and self.level > 0:
+                self._good_windows = 0
+                self.level -= 1
+                self.changes += 1
+                return True
+        else:
+            self._good_windows = 0
+        return False
+
+    def stats(self):
+        return {'level': self.settings['name'], 'auto': self.auto, 'changes': self.changes}
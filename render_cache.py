@@ -0,0 +1,205 @@
+"""Caches for pre-rendered surfaces.
+
+SpriteCache holds falling-object sprites already scaled and rotated, each
+with its drop shadow. Rotation is quantized to ANGLE_STEP degrees and the
+size (base scale times wobble) to SIZE_STEP pixels, so a sprite is
+transformed once per (image, size, angle) bucket instead of every frame and
+drawing an object is two blits. Entries are evicted least recently used
+first once the cache goes over its memory budget.
+
+ScreenCache keeps the last composition of each static screen (menus,
+leaderboard, game over). A screen is only drawn again when its key, the
+inputs it depends on, changes; otherwise the stored copy is blitted back,
+or nothing is drawn at all when it is already what the display shows.
+Overlays such as the pause screen are not stored, only skipped while shown.
+
+TextCache keeps rendered text surfaces keyed by (font, text, colour, style),
+with the outline or drop shadow already composed into the same surface, so
+a HUD line is one blit instead of three renders and three blits.
+"""
+from collections import OrderedDict
+
+import pygame
+
+from dirty_rects import changed_rect
+
+ANGLE_STEP = 5               # degrees
+SIZE_STEP = 16               # pixels
+SPRITE_CACHE_BYTES = 48 * 1024 * 1024
+SHADOW_ALPHA = 80            # shadow opacity (0-255), applied to the sprite's alpha
+TEXT_CACHE_ENTRIES = 256
+
+# Text styles: where the black copies go relative to the text, in pixels
+TEXT_STYLES = {
+    None: (),
+    'outline': ((-2, 0), (2, 0), (0, -2), (0, 2)),  # render_text_centered
+    'shadow': ((2, 2), (1, 1)),                      # HUD drop shadow
+}
+
+
+class SpriteCache:
+    def __init__(self, budget_bytes=SPRITE_CACHE_BYTES, angle_step=ANGLE_STEP, size_step=SIZE_STEP):
+        self.budget_bytes = budget_bytes
+        self.angle_step = angle_step
+        self.size_step = size_step
+        self._angles = 360 // angle_step
+        self._entries = OrderedDict()  # key -> (sprite, shadow, bytes)
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, image, size, angle):
+        """(sprite, shadow) for image scaled to about size x size px and rotated
+        by about angle degrees. key names the source image (e.g. 'banana' or
+        ('bomb', frame)); image is only used to render on a miss."""
+        size = max(self.size_step, int(round(size / self.size_step)) * self.size_step)
+        step = int(round(angle / self.angle_step)) % self._angles
+        cache_key = (key, size, step)
+        entry = self._entries.get(cache_key)
+        if entry is not None:
+            self._entries.move_to_end(cache_key)
+            self.hits += 1
+            return entry[0], entry[1]
+
+        self.misses += 1
+        sprite = pygame.transform.rotate(pygame.transform.scale(image, (size, size)), step * self.angle_step)
+        shadow = sprite.copy()
+        shadow.fill((0, 0, 0, SHADOW_ALPHA), special_flags=pygame.BLEND_RGBA_MULT)
+        w, h = sprite.get_size()
+        nbytes = 2 * w * h * sprite.get_bytesize()
+        self._entries[cache_key] = (sprite, shadow, nbytes)
+        self.bytes += nbytes
+        while self.bytes > self.budget_bytes and len(self._entries) > 1:
+            _, (_, _, evicted) = self._entries.popitem(last=False)
+            self.bytes -= evicted
+            self.evictions += 1
+        return sprite, shadow
+
+    def set_angle_step(self, angle_step):
+        """Change the rotation quantization; cached sprites are dropped."""
+        if angle_step != self.angle_step:
+            self.angle_step = angle_step
+            self._angles = 360 // angle_step
+            self.clear()
+
+    def clear(self):
+        self._entries.clear()
+        self.bytes = 0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {'entries': len(self._entries), 'kib': self.bytes // 1024, 'hits': self.hits,
+                'misses': self.misses, 'evictions': self.evictions,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0}
+
+
+class ScreenCache:
+    def __init__(self, target, dirty):
+        self.target = target
+        self.dirty = dirty  # DirtyRectTracker that presents the frame
+        self._screens = {}  # name -> (key, surface)
+        self._shown = None  # (name, key) currently on the display
+        self.renders = 0
+        self.reuses = 0
+        self.skips = 0
+
+    def present(self, name, key, render, keep=True):
+        """Show screen name on the display. render() draws it onto the target
+        and only runs when key differs from the last call for this screen.
+        With keep=False (an overlay on whatever the display showed, like the
+        pause screen) no copy is stored, so render() runs every time the
+        screen isn't already on the display. Returns True if the display had
+        to be updated."""
+        if self._shown == (name, key):
+            self.skips += 1
+            return False
+        entry = self._screens.get(name) if keep else None
+        changed = self.target.get_rect()
+        if entry is not None and entry[0] == key:
+            self.target.blit(entry[1], (0, 0))
+            self.reuses += 1
+        else:
+            render()
+            if keep:
+                if entry is None:
+                    surface = self.target.copy()
+                else:
+                    surface = entry[1]
+                    if self.dirty.enabled and self._shown is not None and self._shown[0] == name:
+                        # Same screen with new inputs (e.g. another button selected):
+                        # only the pixels that differ from what is shown need updating
+                        changed = changed_rect(surface, self.target)
+                    surface.blit(self.target, (0, 0))
+                self._screens[name] = (key, surface)
+            self.renders += 1
+        self._shown = (name, key)
+        if changed == self.target.get_rect():
+            self.dirty.full()
+        else:
+            self.dirty.add(changed)
+        self.dirty.present(name)
+        return True
+
+    def displaced(self):
+        """Something else was drawn on the display; the next present() must redraw."""
+        self._shown = None
+
+    def invalidate(self, name=None):
+        """Drop the stored copy of one screen (or all of them)."""
+        if name is None:
+            self._screens.clear()
+        else:
+            self._screens.pop(name, None)
+        self._shown = None
+
+    def stats(self):
+        return {'renders': self.renders, 'reuses': self.reuses, 'skips': self.skips}
+
+
+class TextCache:
+    def __init__(self, max_entries=TEXT_CACHE_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # (font, text, color, style) -> (surface, text rect)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, font, text, color, style=None):
+        """(surface, rect): text rendered with its style, and where the text
+        itself sits inside surface (blit at pos - rect.topleft to put the
+        text at pos)."""
+        key = (font, text, color, style)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+        self.misses += 1
+        main = font.render(text, True, color)
+        offsets = TEXT_STYLES[style]
+        if offsets:
+            left = max(0, -min(dx for dx, _ in offsets))
+            top = max(0, -min(dy for _, dy in offsets))
+            right = max(0, max(dx for dx, _ in offsets))
+            bottom = max(0, max(dy for _, dy in offsets))
+            w, h = main.get_size()
+            surface = pygame.Surface((w + left + right, h + top + bottom), pygame.SRCALPHA)
+            back = font.render(text, True, (0, 0, 0))
+            for dx, dy in offsets:
+                surface.blit(back, (left + dx, top + dy))
+            surface.blit(main, (left, top))
+            entry = (surface, pygame.Rect(left, top, w, h))
+        else:
+            entry = (main, main.get_rect())
+        self._entries[key] = entry
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        return entry
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {'entries': len(self._entries), 'hits': self.hits, 'misses': self.misses,
+                'evictions': self.evictions, 'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0}
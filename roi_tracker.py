@@ -0,0 +1,115 @@
+"""Region-of-interest tracking for hand inference.
+
+Once a hand has been found, the next frame only needs to be searched around
+where it was. RoiTracker keeps the hand's bounding box from the previous
+landmarks, predicts where it moves next and cuts a square crop around it
+with a margin that grows with the hand's speed. The crop is downscaled to a
+fixed inference size before colour conversion, so MediaPipe and cvtColor see
+a small image no matter how large the camera frame is. When the hand is not
+found inside the crop, the next frame falls back to the (downscaled) full
+frame.
+
+Landmarks from a crop are mapped back to normalized full-frame coordinates,
+which the game scales to WIDTH/HEIGHT as before.
+"""
+import cv2
+import numpy as np
+
+ROI_INPUT_SIZE = 256       # crops are resized to ROI_INPUT_SIZE x ROI_INPUT_SIZE
+FULL_FRAME_MAX_WIDTH = 640  # full-frame searches are downscaled to at most this width
+# INTER_AREA averages every source pixel, which on a 1080p full frame costs
+# about four times INTER_LINEAR; the full-frame search only has to find the
+# hand, so it takes the cheaper filter. Crops are small enough to keep AREA.
+FULL_FRAME_INTERPOLATION = cv2.INTER_LINEAR
+CROP_INTERPOLATION = cv2.INTER_AREA
+
+
+class RoiTracker:
+    def __init__(self, frame_shape, input_size=ROI_INPUT_SIZE, full_frame_width=FULL_FRAME_MAX_WIDTH,
+                 base_margin=0.3, velocity_gain=1.5, min_side=0.2):
+        self.frame_h, self.frame_w = frame_shape[:2]
+        self.input_size = input_size
+        self.full_frame_width = full_frame_width
+        self.base_margin = base_margin      # margin as a fraction of the hand box side
+        self.velocity_gain = velocity_gain  # extra margin per pixel of movement per inference
+        self.min_side = int(min_side * min(self.frame_w, self.frame_h))
+
+        # Resize targets reused every frame (crop and downscaled full frame)
+        self._crop_buf = np.empty((input_size, input_size, 3), dtype=np.uint8)
+        self._full_buf = None
+        if self.frame_w > full_frame_width:
+            full_h = int(self.frame_h * full_frame_width / self.frame_w)
+            self._full_buf = np.empty((full_h, full_frame_width, 3), dtype=np.uint8)
+
+        self._center = None      # hand box centre in pixels, or None when lost
+        self._side = 0.0
+        self._velocity = np.zeros(2)
+        self.crops = 0
+        self.full_frames = 0
+        self.lost = 0
+
+    @property
+    def tracking(self):
+        return self._center is not None
+
+    def region(self):
+        """Pixel rectangle (x0, y0, x1, y1) to search next."""
+        if self._center is None:
+            return 0, 0, self.frame_w, self.frame_h
+        speed = float(np.hypot(*self._velocity))
+        side = self._side * (1 + 2 * self.base_margin) + 2 * self.velocity_gain * speed
+        side = int(min(max(side, self.min_side), self.frame_w, self.frame_h))
+        cx, cy = self._center + self._velocity
+        x0 = int(min(max(cx - side / 2, 0), self.frame_w - side))
+        y0 = int(min(max(cy - side / 2, 0), self.frame_h - side))
+        return x0, y0, x0 + side, y0 + side
+
+    def prepare(self, frame):
+        """Crop and downscale a BGR frame for inference.
+
+        Returns (image, region); pass region to map_to_frame() with the
+        landmarks detected in image. image is a buffer reused by the next
+        call (or frame itself when no resize is needed).
+        """
+        region = self.region()
+        x0, y0, x1, y1 = region
+        if self._center is None:
+            self.full_frames += 1
+            if self._full_buf is None:
+                return frame, region
+            dst, interpolation = self._full_buf, FULL_FRAME_INTERPOLATION
+        else:
+            self.crops += 1
+            dst, interpolation = self._crop_buf, CROP_INTERPOLATION
+        cv2.resize(frame[y0:y1, x0:x1], (dst.shape[1], dst.shape[0]), dst=dst, interpolation=interpolation)
+        return dst, region
+
+    def map_to_frame(self, points, region):
+        """Convert (..., 3) crop-normalized landmarks to full-frame normalized, in place."""
+        x0, y0, x1, y1 = region
+        scale_x = (x1 - x0) / self.frame_w
+        points[..., 0] = x0 / self.frame_w + points[..., 0] * scale_x
+        points[..., 1] = y0 / self.frame_h + points[..., 1] * (y1 - y0) / self.frame_h
+        # z uses the same scale as x in MediaPipe's output
+        points[..., 2] *= scale_x
+        return points
+
+    def update(self, hands):
+        """Feed back the (count, 21, 3) full-frame normalized landmarks just detected."""
+        if len(hands) == 0:
+            if self._center is not None:
+                self.lost += 1
+            self._center = None
+            self._velocity[:] = 0
+            return
+        xs = hands[..., 0] * self.frame_w
+        ys = hands[..., 1] * self.frame_h
+        x_min, x_max, y_min, y_max = xs.min(), xs.max(), ys.min(), ys.max()
+        center = np.array([(x_min + x_max) / 2, (y_min + y_max) / 2])
+        if self._center is not None:
+            self._velocity = center - self._center
+        self._center = center
+        self._side = max(x_max - x_min, y_max - y_min)
+
+    def stats(self):
+        return {'crops': self.crops, 'full_frames': self.full_frames, 'lost': self.lost}
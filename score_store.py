@@ -0,0 +1,402 @@
+"""SQLite high-score store.
+
+ScoreStore owns one connection for the life of the game instead of a
+connect/close per query. The database runs in WAL mode with
+synchronous=NORMAL, so a saved score costs an append to the write-ahead log
+rather than a full fsync of the database, and readers are never blocked by
+a write. busy_timeout makes a second process (another kiosk instance, a
+backup) wait for the lock instead of failing at once.
+
+The schema is migrated once, when the store opens, and its version is kept
+in PRAGMA user_version. Each migration brings the database up one version;
+they are written so that databases created by older versions of the game,
+which added columns on the fly, upgrade cleanly. Queries are module
+constants, so sqlite3's statement cache prepares each of them only once
+per connection.
+
+The ranking query reads a covering index in ranking order, so the top N
+costs N index entries however many games are stored; deeper pages seek
+into the same index from a keyset cursor instead of using OFFSET. A
+score's rank sums the score_counts table (runs per distinct score and
+level) above it rather than counting rows. Per-level totals
+(play time, runs, best score) live in level_stats, which triggers on
+scores keep current on every insert and delete; reading them is one row
+per level.
+
+LeaderboardCache sits in front of the store for the screens that list
+scores; see its docstring.
+"""
+import sqlite3
+from datetime import datetime, timezone
+
+BUSY_TIMEOUT_MS = 5000
+SYNC_TIMEOUT = 0.25  # seconds a store read waits for queued scores, then reads anyway
+STATEMENT_CACHE = 32
+
+INSERT_SCORE = "INSERT INTO scores(name, score, level, duration_sec, created_at) VALUES (?, ?, ?, ?, ?)"
+ROW_COLUMNS = "name, score, level, duration_sec, created_at"
+# Ranking order, spelled out to the last column so it is the covering indexes' order
+RANK_ORDER = "score DESC, created_at ASC, name ASC, level ASC, duration_sec ASC"
+REVERSE_ORDER = "score ASC, created_at DESC, name DESC, level DESC, duration_sec DESC"
+SELECT_TOP = f"SELECT {ROW_COLUMNS} FROM scores ORDER BY {RANK_ORDER} LIMIT ?"
+# Keyed by whether the query is limited to one level (difficulty)
+SELECT_FROM = {  # rows from (score, created_at) on, in ranking order
+    False: f"SELECT {ROW_COLUMNS} FROM scores WHERE score <= :score "
+           f"AND (score < :score OR created_at >= :created_at) ORDER BY {RANK_ORDER} LIMIT :limit",
+    True: f"SELECT {ROW_COLUMNS} FROM scores WHERE level = :level AND score <= :score "
+          f"AND (score < :score OR created_at >= :created_at) ORDER BY {RANK_ORDER} LIMIT :limit",
+}
+SELECT_FIRST = {
+    False: SELECT_TOP.replace('LIMIT ?', 'LIMIT :limit'),
+    True: f"SELECT {ROW_COLUMNS} FROM scores WHERE level = :level ORDER BY {RANK_ORDER} LIMIT :limit",
+}
+SELECT_ABOVE = {  # rows ranked above (score, created_at), nearest first
+    False: f"SELECT {ROW_COLUMNS} FROM scores WHERE score >= :score "
+           f"AND (score > :score OR created_at < :created_at) ORDER BY {REVERSE_ORDER} LIMIT :limit",
+    True: f"SELECT {ROW_COLUMNS} FROM scores WHERE level = :level AND score >= :score "
+          f"AND (score > :score OR created_at < :created_at) ORDER BY {REVERSE_ORDER} LIMIT :limit",
+}
+SELECT_BELOW = {  # rows ranked below (score, created_at), nearest first
+    False: f"SELECT {ROW_COLUMNS} FROM scores WHERE score <= :score "
+           f"AND (score < :score OR created_at > :created_at) ORDER BY {RANK_ORDER} LIMIT :limit",
+    True: f"SELECT {ROW_COLUMNS} FROM scores WHERE level = :level AND score <= :score "
+          f"AND (score < :score OR created_at > :created_at) ORDER BY {RANK_ORDER} LIMIT :limit",
+}
+COUNT_HIGHER = {
+    False: "SELECT COALESCE(SUM(runs), 0) FROM score_counts WHERE score > :score",
+    True: "SELECT COALESCE(SUM(runs), 0) FROM score_counts WHERE score > :score AND level = :level",
+}
+COUNT_EARLIER_TIES = {
+    False: "SELECT COUNT(*) FROM scores WHERE score = :score AND created_at < :created_at",
+    True: "SELECT COUNT(*) FROM scores WHERE level = :level AND score = :score AND created_at < :created_at",
+}
+SELECT_TIME_BY_LEVEL = "SELECT level, total_duration, runs FROM level_stats ORDER BY total_duration DESC"
+SELECT_LEVEL_STATS = "SELECT level, total_duration, runs, best_score FROM level_stats ORDER BY level"
+
+
+def timestamp():
+    """Now, in the format (and UTC) of SQLite's CURRENT_TIMESTAMP."""
+    return datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+
+
+def score_row(name, score, level='unknown', duration_sec=0, created_at=None):
+    """(name, score, level, duration_sec, created_at), as stored and as read back."""
+    return (name, int(score), level, int(duration_sec), created_at or timestamp())
+
+
+def rank_key(row):
+    """Sort key of a score row in ranking order (RANK_ORDER)."""
+    name, score, level, duration_sec, created_at = row
+    return (-score, created_at, name, level, duration_sec)
+
+
+def split_page(cursor, rows, limit):
+    """(page, next cursor) from up to limit + 1 rows read at cursor (see
+    ScoreStore.page); the extra row only tells whether another page follows."""
+    page = rows[:limit]
+    return page, next_cursor(cursor, page) if len(rows) > limit else None
+
+
+def next_cursor(cursor, rows):
+    """Cursor for the page after rows, the page read at cursor."""
+    score, created_at = rows[-1][1], rows[-1][4]
+    skip = sum(1 for row in rows if row[1] == score and row[4] == created_at)
+    if cursor is not None and cursor[:2] == (score, created_at):
+        skip += cursor[2]
+    return (score, created_at, skip)
+
+
+def _columns(conn, table):
+    return {row[1] for row in conn.execute(f'PRAGMA table_info({table})')}
+
+
+def _create_scores(conn):
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS scores (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            score INTEGER NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """
+    )
+
+
+def _add_level_and_duration(conn):
+    columns = _columns(conn, 'scores')
+    if 'level' not in columns:
+        conn.execute("ALTER TABLE scores ADD COLUMN level TEXT DEFAULT 'unknown'")
+    if 'duration_sec' not in columns:
+        conn.execute("ALTER TABLE scores ADD COLUMN duration_sec INTEGER DEFAULT 0")
+
+
+def _add_ranking_index_and_level_stats(conn):
+    # Covering index in ranking order: the top N is the first N index entries
+    conn.execute("CREATE INDEX IF NOT EXISTS scores_rank "
+                 "ON scores(score DESC, created_at ASC, name, level, duration_sec)")
+    # Finds a level's best score again when its best run is deleted
+    conn.execute("CREATE INDEX IF NOT EXISTS scores_level_rank ON scores(level, score DESC, created_at ASC)")
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS level_stats (
+            level TEXT PRIMARY KEY,
+            total_duration INTEGER NOT NULL DEFAULT 0,
+            runs INTEGER NOT NULL DEFAULT 0,
+            best_score INTEGER
+        )
+        """
+    )
+    conn.execute("DELETE FROM level_stats")
+    conn.execute(
+        """
+        INSERT INTO level_stats(level, total_duration, runs, best_score)
+        SELECT level, COALESCE(SUM(duration_sec), 0), COUNT(*), MAX(score) FROM scores
+        WHERE level IS NOT NULL GROUP BY level
+        """
+    )
+    conn.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS level_stats_insert AFTER INSERT ON scores
+        WHEN NEW.level IS NOT NULL
+        BEGIN
+            INSERT OR IGNORE INTO level_stats(level) VALUES (NEW.level);
+            UPDATE level_stats SET total_duration = total_duration + COALESCE(NEW.duration_sec, 0),
+                                   runs = runs + 1,
+                                   best_score = MAX(COALESCE(best_score, NEW.score), NEW.score)
+            WHERE level = NEW.level;
+        END
+        """
+    )
+    conn.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS level_stats_delete AFTER DELETE ON scores
+        WHEN OLD.level IS NOT NULL
+        BEGIN
+            UPDATE level_stats SET total_duration = total_duration - COALESCE(OLD.duration_sec, 0),
+                                   runs = runs - 1,
+                                   best_score = (SELECT MAX(score) FROM scores WHERE level = OLD.level)
+            WHERE level = OLD.level;
+            DELETE FROM level_stats WHERE level = OLD.level AND runs <= 0;
+        END
+        """
+    )
+
+
+def _add_score_counts(conn):
+    # The per-level ranking index gets the remaining row columns, so
+    # per-difficulty pages are read from the index alone
+    conn.execute("DROP INDEX IF EXISTS scores_level_rank")
+    conn.execute("CREATE INDEX IF NOT EXISTS scores_level_rank "
+                 "ON scores(level, score DESC, created_at ASC, name, duration_sec)")
+    # Runs per (score, level): a rank is a sum over the distinct scores above
+    # it instead of a count over every row above it
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS score_counts (
+            score INTEGER NOT NULL,
+            level TEXT NOT NULL,
+            runs INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (score, level)
+        ) WITHOUT ROWID
+        """
+    )
+    conn.execute("DELETE FROM score_counts")
+    conn.execute("INSERT INTO score_counts(score, level, runs) "
+                 "SELECT score, COALESCE(level, ''), COUNT(*) FROM scores GROUP BY score, COALESCE(level, '')")
+    conn.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS score_counts_insert AFTER INSERT ON scores
+        BEGIN
+            INSERT OR IGNORE INTO score_counts(score, level) VALUES (NEW.score, COALESCE(NEW.level, ''));
+            UPDATE score_counts SET runs = runs + 1
+            WHERE score = NEW.score AND level = COALESCE(NEW.level, '');
+        END
+        """
+    )
+    conn.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS score_counts_delete AFTER DELETE ON scores
+        BEGIN
+            UPDATE score_counts SET runs = runs - 1
+            WHERE score = OLD.score AND level = COALESCE(OLD.level, '');
+            DELETE FROM score_counts WHERE score = OLD.score AND level = COALESCE(OLD.level, '') AND runs <= 0;
+        END
+        """
+    )
+
+
+# MIGRATIONS[i] takes the schema from user_version i to i + 1
+MIGRATIONS = [
+    _create_scores,
+    _add_level_and_duration,
+    _add_ranking_index_and_level_stats,
+    _add_score_counts,
+]
+SCHEMA_VERSION = len(MIGRATIONS)
+
+
+class ScoreStore:
+    def __init__(self, path):
+        self.path = path
+        self.conn = sqlite3.connect(path, cached_statements=STATEMENT_CACHE)
+        self.conn.execute(f'PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}')
+        self.conn.execute('PRAGMA journal_mode = WAL')
+        self.conn.execute('PRAGMA synchronous = NORMAL')
+        self.migrate()
+
+    def migrate(self):
+        """Apply the migrations this database hasn't seen yet, each in its own transaction."""
+        version = self.conn.execute('PRAGMA user_version').fetchone()[0]
+        for step in range(version, SCHEMA_VERSION):
+            with self.conn:
+                self.conn.execute('BEGIN')  # sqlite3 doesn't open one for DDL by itself
+                MIGRATIONS[step](self.conn)
+                self.conn.execute(f'PRAGMA user_version = {step + 1}')
+        return version
+
+    @property
+    def version(self):
+        return self.conn.execute('PRAGMA user_version').fetchone()[0]
+
+    def add_score(self, name, score, level='unknown', duration_sec=0):
+        """Insert one finished game and commit; returns its row."""
+        row = score_row(name, score, level, duration_sec)
+        self.add_scores([row])
+        return row
+
+    def add_scores(self, rows):
+        """Insert score_row() tuples in a single transaction."""
+        with self.conn:
+            self.conn.executemany(INSERT_SCORE, rows)
+
+    def top_scores(self, limit=5):
+        """[(name, score, level, duration_sec, created_at)], best first."""
+        return self.conn.execute(SELECT_TOP, (limit,)).fetchall()
+
+    def page(self, cursor=None, limit=10, level=None):
+        """One page of the ranking (of one level if given): (rows, cursor of
+        the next page, or None after the last). Pages are keyset-paginated:
+        the cursor is where the previous page stopped, (score, created_at,
+        rows already shown with exactly that score and time), so every page
+        is an index seek, however deep."""
+        params = {'level': level}
+        if cursor is None:
+            params['limit'] = limit + 1
+            rows = self.conn.execute(SELECT_FIRST[level is not None], params).fetchall()
+        else:
+            score, created_at, skip = cursor
+            params.update(score=score, created_at=created_at, limit=limit + 1 + skip)
+            rows = self.conn.execute(SELECT_FROM[level is not None], params).fetchall()[skip:]
+        return split_page(cursor, rows, limit)
+
+    def rank(self, score, created_at=None, level=None):
+        """1-based place of a score (saved at created_at, default now) in the
+        ranking, or in one level's; earlier equal scores place ahead of it."""
+        params = {'score': int(score), 'created_at': created_at or timestamp(), 'level': level}
+        filtered = level is not None
+        higher = self.conn.execute(COUNT_HIGHER[filtered], params).fetchone()[0]
+        ties = self.conn.execute(COUNT_EARLIER_TIES[filtered], params).fetchone()[0]
+        return 1 + higher + ties
+
+    def neighbours(self, score, created_at, span=2, level=None):
+        """(above, below): up to span rows ranked just above and just below
+        a score, each in ranking order."""
+        params = {'score': int(score), 'created_at': created_at, 'level': level, 'limit': span}
+        filtered = level is not None
+        above = self.conn.execute(SELECT_ABOVE[filtered], params).fetchall()[::-1]
+        below = self.conn.execute(SELECT_BELOW[filtered], params).fetchall()
+        return above, below
+
+    def time_played_by_level(self):
+        """[(level, total duration_sec, runs)], most played first."""
+        return self.conn.execute(SELECT_TIME_BY_LEVEL).fetchall()
+
+    def level_stats(self):
+        """[(level, total duration_sec, runs, best score)] from the trigger-kept summary."""
+        return self.conn.execute(SELECT_LEVEL_STATS).fetchall()
+
+    def close(self):
+        self.conn.close()
+
+
+class LeaderboardCache:
+    """The top rows and per-level totals, kept in memory.
+
+    Both are read from the store once; after that add_score() writes through
+    (to the store, or queued on a ScoreWriter when one is given) and updates
+    them in place, so the leaderboard and game-over screens never query the
+    database. Only a request for more than the cached number of rows goes to
+    the store, and it first gives the writer up to SYNC_TIMEOUT to commit
+    what is queued. rank() never waits: it adds the writer's pending rows
+    that place ahead to the store's count.
+    """
+
+    def __init__(self, store, top_n=10, writer=None):
+        self.store = store
+        self.writer = writer
+        self.top_n = top_n
+        self._top = store.top_scores(top_n)
+        self._levels = {level: [total, runs] for level, total, runs in store.time_played_by_level()}
+        self.hits = 0
+        self.misses = 0
+
+    def add_score(self, name, score, level='unknown', duration_sec=0):
+        row = score_row(name, score, level, duration_sec)
+        if self.writer:
+            self.writer.submit(row)
+        else:
+            self.store.add_scores([row])
+        # Same order as the store's ranking: score descending, then oldest first
+        at = next((i for i, r in enumerate(self._top) if rank_key(r) > rank_key(row)), len(self._top))
+        if at < self.top_n:
+            self._top.insert(at, row)
+            del self._top[self.top_n:]
+        totals = self._levels.setdefault(row[2], [0, 0])
+        totals[0] += row[3]
+        totals[1] += 1
+        return row
+
+    def _sync(self):
+        """Briefly wait for queued scores to reach the store before reading it;
+        if the database stays locked the read goes ahead without them."""
+        if self.writer:
+            self.writer.flush(SYNC_TIMEOUT)
+
+    def top_scores(self, limit=5):
+        if limit > self.top_n:
+            self.misses += 1
+            self._sync()
+            return self.store.top_scores(limit)
+        self.hits += 1
+        return self._top[:limit]
+
+    def page(self, cursor=None, limit=10, level=None):
+        """ScoreStore.page(); the first page of the overall ranking comes from memory."""
+        if cursor is None and level is None and (limit < self.top_n or len(self._top) < self.top_n):
+            # The cached rows are either the whole table or include the row after the page
+            self.hits += 1
+            return split_page(None, self._top, limit)
+        self.misses += 1
+        self._sync()
+        return self.store.page(cursor, limit, level)
+
+    def rank(self, score, created_at=None, level=None):
+        """ScoreStore.rank(), also counting scores still queued on the writer.
+        A batch that commits during the lookup can be counted twice."""
+        place = self.store.rank(score, created_at, level)
+        if self.writer:
+            key = rank_key(score_row('', score, created_at=created_at))[:2]
+            place += sum(1 for row in self.writer.pending_rows()
+                         if rank_key(row)[:2] < key and (level is None or row[2] == level))
+        return place
+
+    def time_played_by_level(self):
+        self.hits += 1
+        return sorted(((level, total, runs) for level, (total, runs) in self._levels.items()),
+                      key=lambda row: row[1], reverse=True)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {'hits': self.hits, 'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0}
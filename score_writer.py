@@ -0,0 +1,119 @@
+"""Background writer for saved scores.
+
+Saving a score at game over used to run the insert and its commit inside
+the frame, which on slow storage shows up as a hitch. ScoreWriter hands the
+rows to a writer thread instead. The thread has its own ScoreStore
+connection (sqlite3 connections belong to the thread that opened them),
+drains whatever has queued up into one transaction, and when the database
+is locked by another process it backs off and retries the same batch
+rather than dropping it.
+
+flush() waits until everything submitted so far is on disk; close() flushes
+and stops the thread, and is what the game calls on the way out. Rows not
+committed yet are also available from pending_rows(), for readers that
+must not wait for the database.
+"""
+import queue
+import sqlite3
+import threading
+import time
+
+from score_store import ScoreStore
+
+BATCH_SIZE = 64
+RETRY_DELAY = 0.05   # seconds, doubled per attempt
+MAX_RETRIES = 8
+_STOP = object()
+
+
+class ScoreWriter:
+    def __init__(self, path, batch_size=BATCH_SIZE, retry_delay=RETRY_DELAY, max_retries=MAX_RETRIES):
+        self.path = path
+        self.batch_size = batch_size
+        self.retry_delay = retry_delay
+        self.max_retries = max_retries
+        self._queue = queue.Queue()
+        self._pending = 0
+        self._unwritten = []  # submitted rows not yet written or given up on, oldest first
+        self._idle = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name='score-writer', daemon=True)
+        self.written = 0
+        self.batches = 0
+        self.retries = 0
+        self.failed = 0
+        self._thread.start()
+
+    def submit(self, row):
+        """Queue one score_row() tuple; returns at once."""
+        with self._idle:
+            self._pending += 1
+            self._unwritten.append(row)
+        self._queue.put(row)
+
+    def pending_rows(self):
+        """The submitted rows still waiting for their commit, oldest first."""
+        with self._idle:
+            return list(self._unwritten)
+
+    def flush(self, timeout=None):
+        """Wait until every submitted row has been written (or given up on).
+        Returns False if timeout ran out first."""
+        with self._idle:
+            return self._idle.wait_for(lambda: self._pending == 0, timeout)
+
+    def close(self, timeout=None):
+        """Write what is queued, then stop the thread."""
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join(timeout)
+
+    def _run(self):
+        try:
+            store = ScoreStore(self.path)
+        except sqlite3.Error as e:
+            print('Score writer could not open the database:', e)
+            store = None
+        stopping = False
+        while not stopping:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if batch[-1] is _STOP:
+                batch.pop()
+                stopping = True
+            if batch:
+                self._write(store, batch)
+                with self._idle:
+                    self._pending -= len(batch)
+                    del self._unwritten[:len(batch)]
+                    self._idle.notify_all()
+        if store:
+            store.close()
+
+    def _write(self, store, batch):
+        for attempt in range(self.max_retries + 1):
+            try:
+                if store is None:
+                    raise sqlite3.OperationalError('database not open')
+                store.add_scores(batch)
+                self.written += len(batch)
+                self.batches += 1
+                return
+            except sqlite3.OperationalError as e:
+                locked = 'locked' in str(e) or 'busy' in str(e)
+                if not locked or attempt == self.max_retries:
+                    print('Score save failed:', e)
+                    break
+                self.retries += 1
+                time.sleep(self.retry_delay * 2 ** attempt)
+            except sqlite3.Error as e:
+                print('Score save failed:', e)
+                break
+        self.failed += len(batch)
+
+    def stats(self):
+        return {'written': self.written, 'batches': self.batches, 'retries': self.retries,
+                'failed': self.failed, 'pending': self._pending}
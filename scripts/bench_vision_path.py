@@ -0,0 +1,98 @@
+"""Benchmark the per-frame image work on the vision path, before and after
+the copy-free changes (no camera or MediaPipe needed).
+
+    before: cv2.flip + cv2.cvtColor on the full frame, new arrays every frame
+    after:  one copy into the shared-memory slot, ROI crop/resize and colour
+            conversion into reused buffers, read-only view for MediaPipe
+
+For each camera resolution it prints milliseconds per frame and the bytes
+newly allocated per frame (tracemalloc peak over the frame's own work).
+
+Usage: python scripts/bench_vision_path.py [--frames N]
+"""
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from hand_inference import RgbConverter  # noqa: E402
+from roi_tracker import RoiTracker  # noqa: E402
+
+RESOLUTIONS = [(640, 480), (1280, 720), (1920, 1080)]
+
+
+def before_path(frame, state):
+    frame = cv2.flip(frame, 1)
+    return cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+
+
+def after_path(frame, state):
+    slot, roi, to_rgb = state
+    np.copyto(slot, frame)
+    image, region = roi.prepare(slot)
+    return to_rgb(image)
+
+
+def make_after_state(shape, tracking):
+    roi = RoiTracker(shape)
+    if tracking:
+        # Pretend a hand was found near the centre so prepare() crops
+        hand = np.zeros((1, 21, 3))
+        hand[0, :, 0] = np.linspace(0.45, 0.55, 21)
+        hand[0, :, 1] = np.linspace(0.4, 0.6, 21)
+        roi.update(hand)
+    return np.empty(shape, dtype=np.uint8), roi, RgbConverter()
+
+
+def measure(path, frames, state, n):
+    # Warm up (buffers are created on first use)
+    for frame in frames[:3]:
+        path(frame, state)
+
+    gc.collect()
+    gc_before = sum(s['collections'] for s in gc.get_stats())
+    start = time.perf_counter()
+    for i in range(n):
+        path(frames[i % len(frames)], state)
+    ms = (time.perf_counter() - start) * 1000 / n
+    collections = sum(s['collections'] for s in gc.get_stats()) - gc_before
+
+    tracemalloc.start()
+    allocated = 0
+    for i in range(min(n, 50)):
+        base, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        path(frames[i % len(frames)], state)
+        allocated += tracemalloc.get_traced_memory()[1] - base
+    tracemalloc.stop()
+    return ms, allocated / min(n, 50), collections
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--frames', type=int, default=300, help='frames per measurement')
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"{'resolution':<11} {'path':<22} {'ms/frame':>9} {'KiB alloc/frame':>16} {'gc runs':>8}")
+    for w, h in RESOLUTIONS:
+        shape = (h, w, 3)
+        frames = [rng.integers(0, 256, shape, dtype=np.uint8) for _ in range(4)]
+        runs = [
+            ('before', before_path, None),
+            ('after (full frame)', after_path, make_after_state(shape, tracking=False)),
+            ('after (tracking crop)', after_path, make_after_state(shape, tracking=True)),
+        ]
+        for name, path, state in runs:
+            ms, alloc, collections = measure(path, frames, state, args.frames)
+            print(f'{f"{w}x{h}":<11} {name:<22} {ms:>9.3f} {alloc / 1024:>16.1f} {collections:>8}')
+
+
+if __name__ == '__main__':
+    main()
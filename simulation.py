@@ -0,0 +1,61 @@
+"""Fixed-timestep game clock.
+
+The game simulates in steps of exactly 1/SIM_RATE seconds, however often it
+is drawn. Each rendered frame, advance() adds the time that passed (on the
+input backend's clock, so a replay steps exactly as the recording did) to an
+accumulator and returns how many whole steps are due; what is left over, as
+a fraction of a step, is alpha, which the renderer uses to interpolate
+between the previous and current simulation state. A slow machine runs
+several steps per frame and keeps game speed; a fast display draws several
+frames per step and they still move smoothly.
+
+At most MAX_STEPS steps run per frame. Beyond that (a long stall, a window
+drag) the backlog is dropped rather than caught up, which would only make
+the next frame slower still.
+"""
+SIM_RATE = 60          # steps per second; the game's constants are tuned per 1/60 s step
+MAX_STEPS = 5
+
+
+def lerp(previous, current, alpha):
+    return previous + (current - previous) * alpha
+
+
+class FixedTimestep:
+    def __init__(self, rate=SIM_RATE, max_steps=MAX_STEPS):
+        self.dt = 1.0 / rate
+        self.max_steps = max_steps
+        self.alpha = 1.0
+        self.steps = 0
+        self.frames = 0
+        self.dropped = 0.0  # seconds of backlog discarded
+        self._last = None
+        self._accumulator = 0.0
+
+    def reset(self):
+        """Start over on the next advance(), e.g. after a pause."""
+        self._last = None
+
+    def advance(self, now):
+        """Steps to simulate for a frame at time now (seconds)."""
+        if self._last is None:
+            # First frame after a (re)start: one step, nothing to catch up
+            self._accumulator = self.dt
+        else:
+            self._accumulator += max(0.0, now - self._last)
+        self._last = now
+        steps = int(self._accumulator / self.dt)
+        if steps > self.max_steps:
+            self.dropped += (steps - self.max_steps) * self.dt
+            self._accumulator -= (steps - self.max_steps) * self.dt
+            steps = self.max_steps
+        self._accumulator -= steps * self.dt
+        self.alpha = min(1.0, self._accumulator / self.dt)
+        self.steps += steps
+        self.frames += 1
+        return steps
+
+    def stats(self):
+        return {'steps': self.steps, 'frames': self.frames,
+                'steps_per_frame': round(self.steps / self.frames, 3) if self.frames else 0.0,
+                'dropped_s': round(self.dropped, 3)}
@@ -0,0 +1,21 @@
+import numpy as np
+
+from gestures import CLOSED_DEBOUNCE, FINGER_PIPS, FINGER_TIPS, GestureTracker
+from hand_inference import NUM_LANDMARKS
+
+
+def closed_hand():
+    hand = np.full((1, NUM_LANDMARKS, 3), 0.5, dtype=np.float32)
+    hand[0, FINGER_PIPS, 1] = 0.4
+    hand[0, FINGER_TIPS, 1] = 0.6  # every fingertip below its middle joint
+    return hand
+
+
+def test_closed_needs_full_debounce_during_warm_up():
+    tracker = GestureTracker(800, 600)
+    on_frames = CLOSED_DEBOUNCE[0]
+    for i in range(on_frames - 1):
+        tracker.update(closed_hand(), i / 30)
+        assert not tracker.closed[0]
+    tracker.update(closed_hand(), on_frames / 30)
+    assert tracker.closed[0]
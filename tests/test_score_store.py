@@ -0,0 +1,103 @@
+import random
+import sqlite3
+
+import pytest
+
+from score_store import SCHEMA_VERSION, LeaderboardCache, ScoreStore, rank_key, score_row
+
+LEVELS = ('easy', 'medium', 'hard')
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ScoreStore(str(tmp_path / 'scores.db'))
+    yield store
+    store.close()
+
+
+def random_rows(n, seed=0):
+    # Few distinct scores and times, so there are plenty of exact ties
+    rng = random.Random(seed)
+    return [score_row(f'p{i}', rng.randrange(10), rng.choice(LEVELS), rng.randrange(60),
+                      f'2026-01-0{rng.randrange(1, 4)} 12:00:00') for i in range(n)]
+
+
+def all_pages(source, limit, level=None):
+    pages, cursor = [], None
+    while True:
+        rows, cursor = source.page(cursor, limit, level)
+        pages.append(rows)
+        if cursor is None:
+            return pages
+
+
+@pytest.mark.parametrize('limit', [1, 5, 7])
+@pytest.mark.parametrize('level', [None, 'easy'])
+def test_pages_walk_the_ranking(store, limit, level):
+    rows = random_rows(60)
+    store.add_scores(rows)
+    expected = sorted((row for row in rows if level is None or row[2] == level), key=rank_key)
+    pages = all_pages(store, limit, level)
+    assert [row for page in pages for row in page] == expected
+    assert all(pages) and all(len(page) == limit for page in pages[:-1])
+
+
+def test_no_empty_page_after_a_full_last_page(store):
+    store.add_scores(random_rows(10))
+    pages = all_pages(store, 5)
+    assert [len(page) for page in pages] == [5, 5]
+
+
+def test_rank_matches_a_brute_force_count(store):
+    rows = random_rows(80)
+    store.add_scores(rows)
+    for name, score, level, duration_sec, created_at in rows[:20]:
+        for filter_level in (None, level):
+            better = [row for row in rows if (filter_level is None or row[2] == filter_level)
+                      and rank_key(row)[:2] < (-score, created_at)]
+            assert store.rank(score, created_at, filter_level) == 1 + len(better)
+
+
+def test_triggers_keep_the_summaries_current(store):
+    rows = random_rows(50)
+    store.add_scores(rows)
+    store.conn.execute('DELETE FROM scores WHERE score < 3 OR level = ?', ('hard',))
+    store.conn.commit()
+    left = store.conn.execute('SELECT name, score, level, duration_sec, created_at FROM scores').fetchall()
+    counts = dict(((score, level), runs) for score, level, runs in
+                  store.conn.execute('SELECT score, level, runs FROM score_counts'))
+    expected = {}
+    for row in left:
+        expected[row[1], row[2]] = expected.get((row[1], row[2]), 0) + 1
+    assert counts == expected
+    stats = {level: (total, runs, best) for level, total, runs, best in store.level_stats()}
+    assert 'hard' not in stats
+    for level in stats:
+        mine = [row for row in left if row[2] == level]
+        assert stats[level] == (sum(row[3] for row in mine), len(mine), max(row[1] for row in mine))
+
+
+def test_old_database_is_migrated(tmp_path):
+    path = str(tmp_path / 'old.db')
+    conn = sqlite3.connect(path)
+    conn.execute('CREATE TABLE scores (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL, '
+                 'score INTEGER NOT NULL, created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)')
+    conn.execute("INSERT INTO scores(name, score) VALUES ('old', 42)")
+    conn.commit()
+    conn.close()
+    store = ScoreStore(path)
+    try:
+        assert store.version == SCHEMA_VERSION
+        assert store.level_stats() == [('unknown', 0, 1, 42)]
+        assert store.rank(43) == 1 and store.rank(41) == 2
+    finally:
+        store.close()
+
+
+def test_cached_first_page_matches_the_store(store):
+    store.add_scores(random_rows(12))
+    cache = LeaderboardCache(store, top_n=10)
+    cache.add_score('new', 5, 'easy', 30)
+    for limit in (5, 10):
+        assert cache.page(None, limit) == store.page(None, limit)
+    assert cache.top_scores(10) == store.top_scores(10)
@@ -0,0 +1,88 @@
+import sqlite3
+import threading
+
+import pytest
+
+import score_store
+from score_store import ScoreStore, score_row
+from score_writer import ScoreWriter
+
+
+@pytest.fixture
+def path(tmp_path):
+    path = str(tmp_path / 'scores.db')
+    ScoreStore(path).close()  # schema in place before the writer or a lock holder opens it
+    return path
+
+
+def saved_names(path):
+    store = ScoreStore(path)
+    try:
+        return sorted(row[0] for row in store.top_scores(1000))
+    finally:
+        store.close()
+
+
+def rows(n):
+    return [score_row(f'p{i:03}', i, 'easy', 10) for i in range(n)]
+
+
+def hold_lock(path):
+    conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+    conn.execute('BEGIN IMMEDIATE')
+    return conn
+
+
+def test_flush_waits_for_every_submitted_row(path):
+    writer = ScoreWriter(path, batch_size=16)
+    try:
+        for row in rows(100):
+            writer.submit(row)
+        assert writer.flush(timeout=10)
+        assert saved_names(path) == sorted(row[0] for row in rows(100))
+        assert writer.written == 100 and writer.failed == 0
+        assert writer.batches >= 100 // 16 + 1
+        assert writer.pending_rows() == []
+    finally:
+        writer.close()
+
+
+def test_close_writes_what_is_queued(path):
+    writer = ScoreWriter(path)
+    for row in rows(20):
+        writer.submit(row)
+    writer.close(timeout=10)
+    assert not writer._thread.is_alive()
+    assert len(saved_names(path)) == 20
+
+
+def test_locked_database_is_retried_not_dropped(path, monkeypatch):
+    monkeypatch.setattr(score_store, 'BUSY_TIMEOUT_MS', 0)  # fail at once, let the writer back off
+    lock = hold_lock(path)
+    writer = ScoreWriter(path, retry_delay=0.01, max_retries=12)
+    try:
+        for row in rows(5):
+            writer.submit(row)
+        assert not writer.flush(timeout=0.2)
+        assert len(writer.pending_rows()) == 5
+        threading.Timer(0.1, lock.rollback).start()
+        assert writer.flush(timeout=30)
+        assert writer.retries > 0 and writer.failed == 0
+        assert len(saved_names(path)) == 5
+    finally:
+        writer.close()
+        lock.close()
+
+
+def test_gives_up_after_max_retries(path, monkeypatch):
+    monkeypatch.setattr(score_store, 'BUSY_TIMEOUT_MS', 0)
+    lock = hold_lock(path)
+    writer = ScoreWriter(path, retry_delay=0.001, max_retries=2)
+    try:
+        writer.submit(rows(1)[0])
+        assert writer.flush(timeout=10)
+        assert writer.retries == 2 and writer.failed == 1
+    finally:
+        writer.close()
+        lock.close()
+    assert saved_names(path) == []
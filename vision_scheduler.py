@@ -0,0 +1,54 @@
+"""Per-game-state hand inference rates.
+
+Only gameplay reads the hand: 'running' needs every frame, 'paused' just
+watches for the resume/pause gestures, and the remaining screens are driven
+by the keyboard. VisionScheduler decides, for each new camera frame, whether
+it is worth sending to the inference worker in the current game_state.
+"""
+
+FULL_RATE = None  # every new camera frame
+
+# Inference rate in Hz per game_state; 0 turns hand tracking off
+STATE_INFERENCE_RATES = {
+    'running': FULL_RATE,
+    'paused': 8,
+    'main_menu': 0,
+    'menu': 0,
+    'leaderboard': 0,
+    'name_entry': 0,
+    'options': 0,
+    'credits': 0,
+    'game_over': 0,
+}
+
+
+class VisionScheduler:
+    def __init__(self, rates=None, default_rate=0):
+        self.rates = dict(STATE_INFERENCE_RATES if rates is None else rates)
+        self.default_rate = default_rate
+        self._last_time = None
+        self.frames_scheduled = 0
+        self.frames_skipped = 0
+
+    def rate_for(self, game_state):
+        return self.rates.get(game_state, self.default_rate)
+
+    def active(self, game_state):
+        """True if the hand is tracked at all in this state."""
+        return self.rate_for(game_state) != 0
+
+    def should_infer(self, game_state, frame_time):
+        """Decide whether a new frame captured at frame_time goes to inference."""
+        rate = self.rate_for(game_state)
+        if rate == 0:
+            self.frames_skipped += 1
+            return False
+        if rate is not FULL_RATE and self._last_time is not None and frame_time - self._last_time < 1.0 / rate:
+            self.frames_skipped += 1
+            return False
+        self._last_time = frame_time
+        self.frames_scheduled += 1
+        return True
+
+    def stats(self):
+        return {'scheduled': self.frames_scheduled, 'skipped': self.frames_skipped}